@@ -16,9 +16,10 @@ from pandas import read_parquet
 from pheno_utils.config import (
     DICT_PROPERTY_PATH
     )
+from .cache import metadata_registry
 
 # %% ../nbs/14_bulk_data_loader.ipynb 5
-FIELD_TYPE_TO_FUNC = pd.read_csv(DICT_PROPERTY_PATH, index_col='field_type')['load_func'].dropna().to_dict()
+FIELD_TYPE_TO_FUNC = metadata_registry.read_csv(DICT_PROPERTY_PATH, index_col='field_type')['load_func'].dropna().to_dict()
 
 # %% ../nbs/14_bulk_data_loader.ipynb 6
 def get_function_for_field_type(field_type):
@@ -0,0 +1,421 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/17_cache.ipynb.
+
+# %% auto 0
+__all__ = ['metadata_registry', 'get_file_fingerprint', 'TableCache', 'ResultCache', 'MetadataRegistry']
+
+# %% ../nbs/17_cache.ipynb 3
+import os
+import sys
+import json
+import uuid
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from glob import glob
+from typing import List, Any, Dict, Hashable, Union, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+# %% ../nbs/17_cache.ipynb 4
+from pheno_utils.config import (
+    CACHE_PATH,
+    CACHE_SIZE,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_MEMORY
+    )
+
+# %% ../nbs/17_cache.ipynb 5
+def get_file_fingerprint(path: str) -> Union[str, None]:
+    """
+    Get a fingerprint of a local file based on its size and modification time.
+
+    Args:
+        path (str): The path to the file.
+
+    Returns:
+        str: The fingerprint of the file, or None if the file is not a local file.
+    """
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+# %% ../nbs/17_cache.ipynb 6
+class TableCache:
+    """
+    A size-bounded on-disk cache of tables, stored as uncompressed Arrow IPC files that are read
+    via memory mapping. Tables read with dtype_backend='pyarrow' reference the mapped file without copying,
+    and are otherwise converted to NumPy-backed columns. Least recently used tables are evicted when the cache exceeds its maximum size.
+    Files are written atomically, so the cache can be shared by multiple processes.
+
+    Args:
+
+        path (str, optional): The directory where the cache is stored. Defaults to CACHE_PATH.
+        max_size (int, optional): The maximum size of the cache in bytes. Defaults to CACHE_SIZE.
+
+    Attributes:
+
+        path (str): The directory where the cache is stored.
+        max_size (int): The maximum size of the cache in bytes.
+    """
+    version = 1
+    extension = '.arrow'
+    metadata_key = b'pheno_utils'
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        max_size: int = CACHE_SIZE
+    ) -> None:
+        if path is None:
+            raise ValueError('A path for the cache must be given')
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+        os.makedirs(self.path, exist_ok=True)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        files = self.__list_files__()
+        size = sum([f[2] for f in files])
+        return f'TableCache in {self.path}\n{len(files)} tables, {size / 2**20:.1f} / {self.max_size / 2**20:.1f} MB'
+
+    def make_key(self, **kwargs) -> str:
+        """
+        Generate a cache key from the given keyword arguments, which should identify
+        the source of the table and all the parameters that affect its content.
+
+        Returns:
+            str: The cache key.
+        """
+        kwargs['cache_version'] = self.version
+        key = json.dumps(kwargs, sort_keys=True, default=str)
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str, columns: List[str] = None,
+            dtype_backend: Union[None, str] = None) -> Union[Tuple[pd.DataFrame, Dict[str, Any]], None]:
+        """
+        Read a table from the cache.
+
+        Args:
+            key (str): The cache key.
+            columns (List[str], optional): The columns to read (in addition to the index). Defaults to None (all columns).
+            dtype_backend (str, optional): 'pyarrow' to return Arrow-backed columns and index levels that reference
+                the memory-mapped file without copying (categories are still converted). Defaults to None (NumPy-backed columns).
+
+        Returns:
+            Tuple[pd.DataFrame, dict]: The table and its metadata, or None if the table is not in the cache.
+        """
+        path = self.__get_path__(key)
+        try:
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # corrupt or partially evicted file
+            self.__remove__(path)
+            return None
+
+        schema_metadata = table.schema.metadata or {}
+        metadata = json.loads(schema_metadata.get(self.metadata_key, b'{}'))
+        category_names = metadata.pop('category_names', {})
+        if columns is not None:
+            pandas_metadata = table.schema.pandas_metadata or {}
+            index_columns = [col for col in pandas_metadata.get('index_columns', []) if isinstance(col, str)]
+            keep = [col for col in table.column_names if col in columns or col in index_columns]
+            table = table.select(keep)
+
+        if dtype_backend == 'pyarrow':
+            df = table.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+        else:
+            df = table.to_pandas()
+        # Arrow does not keep the name of the categories index
+        for col, name in category_names.items():
+            if col in df.columns:
+                df[col] = df[col].cat.rename_categories(df[col].cat.categories.rename(name))
+        return df, metadata
+
+    def put(self, key: str, df: pd.DataFrame, metadata: Dict[str, Any] = None) -> None:
+        """
+        Write a table to the cache, and evict least recently used tables if needed.
+
+        Args:
+            key (str): The cache key.
+            df (pd.DataFrame): The table.
+            metadata (dict, optional): Additional JSON-serialisable metadata to store with the table. Defaults to None.
+        """
+        table = pa.Table.from_pandas(df)
+        metadata = dict(metadata or {})
+        metadata['category_names'] = {col: df[col].cat.categories.name for col in df.columns
+                                      if isinstance(df[col].dtype, pd.CategoricalDtype)
+                                      and df[col].cat.categories.name is not None}
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[self.metadata_key] = json.dumps(metadata, default=str).encode()
+        table = table.replace_schema_metadata(schema_metadata)
+
+        path = self.__get_path__(key)
+        tmp_path = f'{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)  # atomic, so readers never see a partial file
+        finally:
+            self.__remove__(tmp_path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove least recently used tables until the cache is within its maximum size.
+        Temporary files left by interrupted writes are removed as well.
+        """
+        for tmp_path in glob(os.path.join(self.path, '*.tmp')):
+            try:
+                if time.time() - os.path.getmtime(tmp_path) > 3600:
+                    self.__remove__(tmp_path)
+            except OSError:
+                continue
+
+        files = sorted(self.__list_files__(), key=lambda f: f[1])
+        total_size = sum([f[2] for f in files])
+        for path, _, size in files:
+            if total_size <= self.max_size:
+                break
+            self.__remove__(path)
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Remove all tables from the cache.
+        """
+        for path, _, _ in self.__list_files__():
+            self.__remove__(path)
+
+    def __get_path__(self, key: str) -> str:
+        return os.path.join(self.path, key + self.extension)
+
+    def __list_files__(self) -> List[Tuple[str, float, int]]:
+        """
+        List the cached files with their last access time and size.
+        """
+        files = []
+        for path in glob(os.path.join(self.path, '*' + self.extension)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # removed by another process
+            files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    @staticmethod
+    def __remove__(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# %% ../nbs/17_cache.ipynb 11
+class ResultCache:
+    """
+    An in-memory LRU cache of results, bounded by the number of entries and by their total memory.
+    Results are copied when they are retrieved, so callers cannot modify the cached results.
+
+    Args:
+
+        max_entries (int, optional): The maximum number of cached results. Defaults to RESULT_CACHE_SIZE.
+        max_memory (int, optional): The maximum total memory of cached results in bytes. Defaults to RESULT_CACHE_MEMORY.
+
+    Attributes:
+
+        max_entries (int): The maximum number of cached results.
+        max_memory (int): The maximum total memory of cached results in bytes.
+        hits (int): The number of results that were found in the cache.
+        misses (int): The number of results that were not found in the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESULT_CACHE_SIZE,
+        max_memory: int = RESULT_CACHE_MEMORY
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_memory = max_memory
+        self.hits = 0
+        self.misses = 0
+        self.memory = 0
+        self.__entries__ = OrderedDict()
+        self.__lock__ = threading.Lock()
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f'ResultCache with {len(self.__entries__)} / {self.max_entries} results, ' + \
+            f'{self.memory / 2**20:.1f} / {self.max_memory / 2**20:.1f} MB, {self.hits} hits, {self.misses} misses'
+
+    def __len__(self) -> int:
+        return len(self.__entries__)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a copy of a cached result, and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any: A copy of the result, or None if the result is not cached.
+        """
+        with self.__lock__:
+            entry = self.__entries__.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__entries__.move_to_end(key)
+        return self.__copy__(entry[0])
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a copy of a result, and evict the least recently used results if the cache is full.
+        Results that are larger than the maximum memory are not cached.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The result (a DataFrame, a Series, or a tuple or list of them).
+        """
+        size = self.__get_size__(value)
+        if size > self.max_memory or self.max_entries <= 0:
+            return
+        value = self.__copy__(value)
+        with self.__lock__:
+            if key in self.__entries__:
+                self.memory -= self.__entries__.pop(key)[1]
+            self.__entries__[key] = (value, size)
+            self.memory += size
+            while len(self.__entries__) > self.max_entries or self.memory > self.max_memory:
+                self.memory -= self.__entries__.popitem(last=False)[1][1]
+
+    def clear(self) -> None:
+        """
+        Remove all results from the cache and reset the statistics.
+        """
+        with self.__lock__:
+            self.__entries__.clear()
+            self.memory = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Get the statistics of the cache.
+
+        Returns:
+            dict: The number of hits and misses, and the number of entries and memory used and allowed.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'entries': len(self.__entries__), 'max_entries': self.max_entries,
+                'memory': self.memory, 'max_memory': self.max_memory}
+
+    @staticmethod
+    def __get_size__(value: Any) -> int:
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+        if isinstance(value, (tuple, list)):
+            return sum([ResultCache.__get_size__(v) for v in value])
+        return sys.getsizeof(value)
+
+    @staticmethod
+    def __copy__(value: Any) -> Any:
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy()
+        if isinstance(value, tuple):
+            return tuple([ResultCache.__copy__(v) for v in value])
+        if isinstance(value, list):
+            return [ResultCache.__copy__(v) for v in value]
+        return value
+
+# %% ../nbs/17_cache.ipynb 15
+class MetadataRegistry:
+    """
+    A process-wide registry of parsed metadata files (e.g., data dictionaries, dictionary properties
+    and data codings), so that each file is parsed once and shared by all loaders.
+    Entries are invalidated when the fingerprint of their file changes, and copies are returned,
+    so that the registered tables are never modified.
+
+    Attributes:
+
+        hits (int): The number of files that were found in the registry.
+        misses (int): The number of files that were parsed.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.__entries__ = {}
+        self.__lock__ = threading.Lock()
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f'MetadataRegistry with {len(self.__entries__)} files, {self.hits} hits, {self.misses} misses'
+
+    def __len__(self) -> int:
+        return len(self.__entries__)
+
+    def read_csv(self, path: str, **kwargs) -> pd.DataFrame:
+        """
+        Read a CSV file with pd.read_csv, or copy it from the registry if it was already parsed
+        with the same arguments and has not changed since.
+
+        Args:
+            path (str): The path to the file.
+            **kwargs: Additional keyword arguments to pass to pd.read_csv.
+
+        Returns:
+            pd.DataFrame: A copy of the parsed file.
+        """
+        fingerprint = get_file_fingerprint(path)
+        if fingerprint is None:
+            # not a local file, which cannot be checked for changes
+            return pd.read_csv(path, **kwargs)
+        key = (os.path.abspath(path), json.dumps(kwargs, sort_keys=True, default=str))
+        with self.__lock__:
+            entry = self.__entries__.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self.hits += 1
+                return entry[1].copy()
+            self.misses += 1
+        df = pd.read_csv(path, **kwargs)
+        with self.__lock__:
+            self.__entries__[key] = (fingerprint, df)
+        return df.copy()
+
+    def clear(self) -> None:
+        """
+        Remove all files from the registry and reset the statistics.
+        """
+        with self.__lock__:
+            self.__entries__.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        """
+        Get the statistics of the registry.
+
+        Returns:
+            dict: The number of hits and misses, and the number of registered files.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.__entries__)}
+
+metadata_registry = MetadataRegistry()
@@ -5,7 +5,12 @@ __all__ = ['CohortSelector']
 
 # %% ../nbs/12_cohort_selector.ipynb 3
 import re
-from typing import List, Any, Dict, Union
+import ast
+import io
+import operator
+import functools
+import tokenize
+from typing import List, Any, Dict, Tuple, Union
 import warnings
 
 import numpy as np
@@ -18,6 +23,7 @@ from pheno_utils.config import (
     ERROR_ACTION
 )
 from .meta_loader import MetaLoader
+from .field_stats import ThetaSketch, FieldProfile
 
 # %% ../nbs/12_cohort_selector.ipynb 5
 from typing import Optional
@@ -75,6 +81,11 @@ class CohortSelector:
     def select(self, query: str, add_fields: Optional[List] = []) -> pd.DataFrame:
         """
         Select a subset of the cohort's data based on the given query.
+        Comparisons of a field with a constant (or a list of constants) that must hold for every selected
+        row are pushed down as filters to the dataset of the field, so only matching rows are loaded.
+        When the query uses several datasets, the participants that may match it are first selected from
+        each dataset (see select_participants()), and only their rows are joined.
+        The whole query is then evaluated on the joined data.
 
         Args:
 
@@ -91,7 +102,7 @@ class CohortSelector:
             ValueError: If column names in the query do not match the column names in the metadata.
 
         """
-        column_names = re.findall(r'([a-zA-Z][a-zA-Z0-9_/]*)\b', query)
+        column_names, filters, tree = self.__parse_query__(query)
         if not column_names:
             raise ValueError('No column names found in query')
 
@@ -104,11 +115,494 @@ class CohortSelector:
 
         if type(add_fields) == str:
             add_fields = [add_fields]
-        df = self.ml.load(column_names + add_fields)
+        if tree is not None:
+            datasets = self.__get_field_datasets__(test_cols, column_names)
+            if len({ds for field in column_names for ds in datasets[field]}) > 1:
+                participants = self.__get_participants__(tree.body, datasets, exact=False, universe={})
+                if participants is not None:
+                    filters = filters + [('participant_id', 'in', tuple(participants.tolist()))]
+        df = self.ml.load(column_names + add_fields, filters=filters)
 
         try:
-            return df.query(re.sub(r'\w+/', '', query))
+            df = df.query(re.sub(r'\w+/', '', query))
         except:
             print(re.sub(r'\w+(/)', '__', query))
-            return df.query(re.sub(r'(\w+)/', r'\1__', query))
+            df = df.query(re.sub(r'(\w+)/', r'\1__', query))
+        return self.__restore_array_index__(df)
 
+    def select_participants(self, query: str) -> np.ndarray:
+        """
+        Select the participants that match a query, without joining the rows of the datasets in the query.
+        Each part of the query that uses the fields of a single dataset is evaluated on the rows of that
+        dataset, and holds for a participant if it holds for any of their rows. The participant sets of
+        the parts are then combined: & (and) intersects them, | (or) unites them, and ~ (not) takes the
+        participants of the datasets in the query that are not in the set. Comparisons between fields of
+        different datasets are evaluated on the joined rows of their datasets.
+
+        Args:
+
+            query (str): Query string to filter the participants.
+
+        Returns:
+
+            np.ndarray: The sorted IDs of the selected participants.
+
+        Raises:
+
+            ValueError: If the query cannot be parsed.
+            ValueError: If column names in the query do not match the column names in the metadata.
+
+        """
+        tree, datasets = self.__get_query_fields__(query)
+        return self.__get_participants__(tree.body, datasets, exact=True, universe={})
+
+    def estimate(self, query: str) -> pd.DataFrame:
+        """
+        Estimate how many participants and visits (pairs of participant and research stage) match a query,
+        as selected by select_participants(), from the profiles of its fields (see MetaLoader.get_profiles())
+        instead of their data. Counts are exact when each condition on a field matches whole bins of its profile,
+        and the sketches of the bins hold all their participants. Otherwise, they are estimated within bounds,
+        assuming values are spread evenly within bins. Parts of the query that are not conditions on a single
+        field (e.g., comparisons between fields) are assumed to hold for half of the participants. Parts that
+        combine different fields of the same dataset with & or ~ must hold on the same row, which profiles
+        cannot tell, so their lower bound is 0.
+
+        Args:
+
+            query (str): Query string to filter the participants.
+
+        Returns:
+
+            pd.DataFrame: The estimated count, its lower and upper bounds, and whether it is exact, of participants and visits.
+                Visits are not estimated for datasets without research stages.
+
+        Raises:
+
+            ValueError: If the query cannot be parsed.
+            ValueError: If column names in the query do not match the column names in the metadata.
+
+        """
+        tree, datasets = self.__get_query_fields__(query)
+        profiles = self.ml.get_profiles(sorted({self.__get_profile_name__(field, ds)
+                                                for field, field_datasets in datasets.items() for ds in field_datasets}))
+        counts = {}
+        for key in FieldProfile.keys:
+            if any(profile is None or not profile.has_key(key) for profile in profiles.values()):
+                counts[key] = [np.nan, np.nan, np.nan, False]
+                continue
+            lower, estimate, upper = self.__estimate_participants__(tree.body, datasets, profiles, key)
+            low, high = lower.bounds()[0], upper.bounds()[1]
+            exact = lower.is_exact and upper.is_exact and np.array_equal(lower.hashes, upper.hashes)
+            counts[key] = [float(np.clip(estimate.estimate(), low, high)), low, high, exact]
+        return pd.DataFrame.from_dict(counts, orient='index', columns=['estimate', 'lower', 'upper', 'exact'])
+
+    def count(self, query: str) -> pd.Series:
+        """
+        Count the participants and visits (pairs of participant and research stage) that match a query,
+        as selected by select_participants(). Counts are taken from the profiles of the fields when they
+        are exact (see estimate()), and are otherwise counted on the data.
+
+        Args:
+
+            query (str): Query string to filter the participants.
+
+        Returns:
+
+            pd.Series: The number of participants and visits. Visits are not counted for datasets without research stages.
+
+        """
+        estimates = self.estimate(query)
+        tree, datasets = self.__get_query_fields__(query)
+        counts = pd.Series(pd.NA, index=estimates.index, dtype='Int64', name='count')
+        for key, row in estimates.iterrows():
+            if row['exact']:
+                counts[key] = int(round(row['estimate']))
+            elif not np.isnan(row['estimate']):
+                counts[key] = len(self.__get_participants__(tree.body, datasets, exact=True, universe={},
+                                                            visits=key == 'visits'))
+        return counts
+
+    @staticmethod
+    def __restore_array_index__(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Restore the integer dtype of the array index columns of datasets, which become float when the
+        outer join of the datasets adds rows that are missing from a dataset. Rows that were added by
+        the join to datasets with pushed down filters are removed by the query, so the columns keep the
+        dtype they have without pushing down filters.
+        """
+        cols = [col for col in df.columns[df.columns.str.endswith('__array_index')]
+                if pd.api.types.is_float_dtype(df[col]) and df[col].notna().all()]
+        return df.astype({col: 'int64' for col in cols}) if cols else df
+
+    def __get_query_fields__(self, query: str) -> Tuple[ast.Expression, Dict[str, List[str]]]:
+        """
+        Parse a query, and get the datasets of each of its fields.
+
+        Args:
+            query (str): Query string to filter the participants.
+
+        Returns:
+            Tuple[ast.Expression, Dict[str, List[str]]]: The expression tree, and the datasets of each field.
+        """
+        tree = self.__parse_expression__(query)
+        if tree is None:
+            raise ValueError(f'Could not parse query: {query}')
+        column_names = [self.__get_field_name__(name) for name in self.__get_names__(tree)]
+        if not column_names:
+            raise ValueError('No column names found in query')
+
+        test_cols = self.ml.get(column_names)
+        datasets = self.__get_field_datasets__(test_cols, column_names)
+        missing_cols = [col for col in column_names if not datasets[col]]
+        if len(missing_cols):
+            raise ValueError(f'Column names {missing_cols} in query do not match column names in metadata')
+        return tree, datasets
+
+    def __get_participants__(self, node: ast.AST, datasets: Dict[str, List[str]], exact: bool,
+                             universe: Dict[str, np.ndarray], visits: bool = False) -> Union[np.ndarray, None]:
+        """
+        Get the participants for which an expression holds, combining the participant sets of its parts
+        as in select_participants().
+
+        Args:
+            node (ast.AST): The expression.
+            datasets (Dict[str, List[str]]): The datasets of each field in the query.
+            exact (bool): Whether to get the participants as in select_participants(). Otherwise, get a superset
+                of the participants with a joined row for which the expression holds, as in select(), or None
+                if it may hold for any participant.
+            universe (Dict[str, np.ndarray]): The participants of each dataset, filled as they are loaded.
+            visits (bool, optional): Whether to get the hashed visits (see ThetaSketch.hash_keys()) instead of
+                the participants. Defaults to False.
+
+        Returns:
+            Union[np.ndarray, None]: The sorted IDs of the participants.
+        """
+        fields = [self.__get_field_name__(name) for name in self.__get_names__(node)]
+        node_datasets = {ds for field in fields for ds in datasets[field]}
+        if len(node_datasets) > 1 and isinstance(node, ast.BoolOp):
+            if isinstance(node.op, ast.And):
+                participants = None
+                for value in node.values:
+                    if participants is not None and len(participants) == 0:
+                        break  # the remaining parts cannot add participants
+                    value_participants = self.__get_participants__(value, datasets, exact, universe, visits)
+                    if participants is None or value_participants is None:
+                        participants = value_participants if participants is None else participants
+                    else:
+                        participants = np.intersect1d(participants, value_participants, assume_unique=True)
+                return participants
+            participants = [self.__get_participants__(value, datasets, exact, universe, visits) for value in node.values]
+            if any(p is None for p in participants):
+                return None
+            return functools.reduce(np.union1d, participants)
+
+        if len(node_datasets) > 1 and self.__is_negation__(node) and exact:
+            return np.setdiff1d(self.__get_universe__(datasets, universe, visits),
+                                self.__get_participants__(node.operand, datasets, exact, universe, visits))
+        if len(node_datasets) != 1 and not exact:
+            return None
+        if not node_datasets:
+            # constant expressions hold for all participants or for none
+            participants = self.__get_universe__(datasets, universe, visits)
+            return participants if self.__eval_constant__(node) else participants[:0]
+
+        # expressions are evaluated on the rows of their datasets, after pushing down their filters
+        names = list(dict.fromkeys(self.__get_names__(node)))
+        filters = [(self.__get_field_name__(field), op, value)
+                   for field, op, value in self.__get_pushdown_filters__(node)]
+        df = self.ml.load([self.__get_field_name__(name) for name in names], filters=filters)
+        if len(df.columns) == 0:
+            # datasets without data have no participants
+            return np.array([], dtype=int) if exact else None
+        values = pd.DataFrame({name: df[name] if name in df.columns else df[self.__get_field_name__(name).split('/')[-1]]
+                               for name in names}, index=df.index)
+        if not exact:
+            # rows of the other datasets have missing values in the joined data
+            missing = values.iloc[:0].reset_index(drop=True).reindex([0])
+            if np.asarray(missing.eval(ast.unparse(node)), dtype=bool).any():
+                return None
+        matches = values.eval(ast.unparse(node))
+        return self.__get_keys__(df.index[np.asarray(matches.fillna(False), dtype=bool)], visits)
+
+    def __get_universe__(self, datasets: Dict[str, List[str]], universe: Dict[str, np.ndarray],
+                         visits: bool = False) -> np.ndarray:
+        """
+        Get the participants (or hashed visits) that have rows in any of the datasets of the query.
+        """
+        for ds in sorted({ds for field_datasets in datasets.values() for ds in field_datasets}):
+            if ds not in universe:
+                fields = [field for field, field_datasets in datasets.items() if ds in field_datasets]
+                df = self.ml.load([self.__get_profile_name__(field, ds) for field in fields])
+                universe[ds] = self.__get_keys__(df.index, visits)
+        return functools.reduce(np.union1d, universe.values())
+
+    @staticmethod
+    def __get_keys__(index: pd.Index, visits: bool) -> np.ndarray:
+        """
+        Get the sorted unique participants of rows, or the hashes of their visits (participant and research stage).
+        """
+        if not visits:
+            return np.unique(index.get_level_values('participant_id'))
+        if 'research_stage' not in index.names:
+            raise ValueError('Visits cannot be counted for data without research stages')
+        return np.unique(ThetaSketch.hash_keys(
+            index.droplevel([name for name in index.names if name not in ['participant_id', 'research_stage']])))
+
+    def __estimate_participants__(self, node: ast.AST, datasets: Dict[str, List[str]], profiles: Dict[str, FieldProfile],
+                                  key: str) -> Tuple[ThetaSketch, ThetaSketch, ThetaSketch]:
+        """
+        Estimate the participants (or visits) for which an expression holds, as in select_participants(),
+        from the profiles of its fields.
+
+        Args:
+            node (ast.AST): The expression.
+            datasets (Dict[str, List[str]]): The datasets of each field in the query.
+            profiles (Dict[str, FieldProfile]): The profile of each field, by dataset/field.
+            key (str): 'participants' or 'visits'.
+
+        Returns:
+            Tuple[ThetaSketch, ThetaSketch, ThetaSketch]: Sketches of a subset of the participants, of an estimate,
+                and of a superset.
+        """
+        fields = list(dict.fromkeys(self.__get_field_name__(name) for name in self.__get_names__(node)))
+        node_datasets = sorted({ds for field in fields for ds in datasets[field]})
+
+        def get_universe(dataset_names):
+            return ThetaSketch.union(*[profiles[self.__get_profile_name__(field, ds)].get_sketch(key)
+                                       for field in datasets for ds in datasets[field] if ds in dataset_names])
+
+        if len(fields) == 1 and len(node_datasets) == 1:
+            profile = profiles[self.__get_profile_name__(fields[0], node_datasets[0])]
+            cover = self.__get_cover__(node, profile)
+            if cover is not None:
+                return profile.select(*cover, key=key)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self.__estimate_participants__(value, datasets, profiles, key) for value in node.values]
+            if isinstance(node.op, ast.Or):
+                return tuple(ThetaSketch.union(*sketches) for sketches in zip(*parts))
+            lower, estimate, upper = (ThetaSketch.intersection(*sketches) for sketches in zip(*parts))
+            if len(node_datasets) == 1:
+                # parts on the same dataset must hold on the same row
+                lower = ThetaSketch.empty()
+            return lower, estimate, upper
+
+        if self.__is_negation__(node):
+            lower, estimate, upper = self.__estimate_participants__(node.operand, datasets, profiles, key)
+            if len(node_datasets) > 1:
+                universe = get_universe(set(ds for field_datasets in datasets.values() for ds in field_datasets))
+                return universe.difference(upper), universe.difference(estimate), universe.difference(lower)
+            universe = get_universe(node_datasets)
+            return ThetaSketch.empty(), universe.difference(estimate), universe
+
+        # other expressions may hold for any participant with rows in all their datasets
+        if node_datasets:
+            upper = ThetaSketch.intersection(*[get_universe([ds]) for ds in node_datasets])
+        else:
+            upper = get_universe(set(ds for field_datasets in datasets.values() for ds in field_datasets))
+        return ThetaSketch.empty(), upper.sample(0.5), upper
+
+    @staticmethod
+    def __get_cover__(node: ast.AST, profile: FieldProfile) -> Union[Tuple[np.ndarray, np.ndarray, np.ndarray], None]:
+        """
+        Get the fraction of the rows of each bin of a field's profile for which an expression on the field holds
+        (see FieldProfile.cover()), or None if the expression is not made of comparisons of the field with constants.
+        """
+        if isinstance(node, ast.BoolOp):
+            covers = [CohortSelector.__get_cover__(value, profile) for value in node.values]
+            if any(cover is None for cover in covers):
+                return None
+            lower, estimate, upper = (np.array(fractions) for fractions in zip(*covers))
+            if isinstance(node.op, ast.And):
+                n = len(covers) - 1
+                return np.maximum(0, lower.sum(0) - n), np.maximum(0, estimate.sum(0) - n), upper.min(0)
+            return lower.max(0), np.minimum(1, estimate.sum(0)), np.minimum(1, upper.sum(0))
+
+        if CohortSelector.__is_negation__(node):
+            cover = CohortSelector.__get_cover__(node.operand, profile)
+            if cover is None:
+                return None
+            # missing values match negated comparisons
+            return 1 - cover[2], 1 - cover[1], 1 - cover[0]
+
+        if not isinstance(node, ast.Compare):
+            return None
+        ops = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.NotEq: '!=',
+               ast.In: 'in', ast.NotIn: 'not in'}
+        flipped = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '==', '!=': '!='}
+        covers = []
+        operands = [node.left] + node.comparators
+        for left, op, right in zip(operands[:-1], node.ops, operands[1:]):
+            op = ops.get(type(op))
+            if op is None:
+                return None
+            if isinstance(left, ast.Name) and not isinstance(right, ast.Name):
+                value = right
+            elif isinstance(right, ast.Name) and not isinstance(left, ast.Name) and op in flipped:
+                value, op = left, flipped[op]
+            else:
+                return None
+            try:
+                value = CohortSelector.__eval_constant__(value)
+            except (ValueError, TypeError, ArithmeticError):
+                return None
+            negated = op in ['!=', 'not in']
+            if isinstance(value, list) or op in ['in', 'not in']:
+                # as in DataFrame.query(), comparing to a list with == is a membership test
+                if op not in ['==', '!=', 'in', 'not in'] or not isinstance(value, list):
+                    return None
+                cover = profile.cover('in', value)
+            else:
+                cover = profile.cover('==' if negated else op, value)
+            covers.append((1 - cover[2], 1 - cover[1], 1 - cover[0]) if negated else cover)
+        lower, estimate, upper = (np.array(fractions) for fractions in zip(*covers))
+        n = len(covers) - 1
+        return np.maximum(0, lower.sum(0) - n), np.maximum(0, estimate.sum(0) - n), upper.min(0)
+
+    @staticmethod
+    def __is_negation__(node: ast.AST) -> bool:
+        """
+        Whether an expression negates a condition, with not or ~.
+        """
+        return isinstance(node, ast.UnaryOp) and (isinstance(node.op, ast.Not) or
+            isinstance(node.op, ast.Invert) and isinstance(node.operand, (ast.Compare, ast.BoolOp, ast.UnaryOp)))
+
+    @staticmethod
+    def __get_profile_name__(field: str, dataset: str) -> str:
+        """
+        Get the dataset/field name of a field in a query, given as field or dataset/field.
+        """
+        return f'{dataset}/' + field.split('/')[-1]
+
+    @staticmethod
+    def __get_field_datasets__(found_fields: pd.DataFrame, column_names: List[str]) -> Dict[str, List[str]]:
+        """
+        Get the datasets of the fields in a query, given as field or dataset/field, from their metadata.
+        """
+        found = [col.split('/', 1) for col in found_fields.columns]
+        return {field: sorted({ds for ds, name in found if field in [name, f'{ds}/{name}']})
+                for field in column_names}
+
+    def __parse_query__(self, query: str) -> Tuple[List[str], List[tuple], Union[ast.Expression, None]]:
+        """
+        Parse a query into an expression tree, as in DataFrame.query(), to find the fields it uses and
+        the comparisons that can be pushed down as filters. Queries that cannot be parsed are evaluated
+        only after loading, and their fields are found by name.
+
+        Args:
+            query (str): Query string to filter the data.
+
+        Returns:
+            Tuple[List[str], List[tuple], Union[ast.Expression, None]]: The fields in the query, the (field, op, value)
+                filters, and the expression tree (None if the query could not be parsed).
+        """
+        tree = self.__parse_expression__(query)
+        if tree is None:
+            return re.findall(r'([a-zA-Z][a-zA-Z0-9_/]*)\b', query), [], None
+
+        column_names = [self.__get_field_name__(name) for name in self.__get_names__(tree)]
+        filters = [(self.__get_field_name__(field), op, value)
+                   for field, op, value in self.__get_pushdown_filters__(tree.body)]
+        return column_names, filters, tree
+
+    def __parse_expression__(self, query: str) -> Union[ast.Expression, None]:
+        """
+        Parse a query into an expression tree, or return None if it cannot be parsed.
+        """
+        # dataset/field names are parsed as dataset__field, and & and | have the precedence of and, or
+        expression = re.sub(r'\b(\w+)/(?=[a-zA-Z_])',
+                            lambda m: m.group(1) + '__' if m.group(1) in self.ml.dicts else m.group(0), query)
+        try:
+            tokens = [(tokenize.NAME, {'&': 'and', '|': 'or'}[tok.string])
+                      if tok.type == tokenize.OP and tok.string in ['&', '|'] else (tok.type, tok.string)
+                      for tok in tokenize.generate_tokens(io.StringIO(expression.strip()).readline)]
+            return ast.parse(tokenize.untokenize(tokens), mode='eval')
+        except (SyntaxError, tokenize.TokenError, IndentationError):
+            return None
+
+    @staticmethod
+    def __get_names__(node: ast.AST) -> List[str]:
+        """
+        Get the names of the variables in an expression, in order of appearance.
+        """
+        functions = {id(n.func) for n in ast.walk(node) if isinstance(n, ast.Call)}
+        names = sorted([n for n in ast.walk(node) if isinstance(n, ast.Name) and id(n) not in functions],
+                       key=lambda n: (n.lineno, n.col_offset))
+        return [n.id for n in names]
+
+    def __get_field_name__(self, name: str) -> str:
+        """
+        Convert a name in a parsed query back to a field name, with dataset__field as dataset/field.
+        """
+        dataset = name.split('__')[0]
+        if '__' in name and dataset in self.ml.dicts:
+            return dataset + '/' + name[len(dataset) + 2:]
+        return name
+
+    @staticmethod
+    def __get_pushdown_filters__(node: ast.AST) -> List[tuple]:
+        """
+        Get the comparisons of a field with constants that must hold for the expression to be true,
+        i.e., that are terms of its top-level conjunction. Comparisons that may be true for missing
+        values (!= and not in) are not pushed down, since missing values never match a filter.
+
+        Args:
+            node (ast.AST): The expression.
+
+        Returns:
+            List[tuple]: The (field, op, value) filters.
+        """
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            return [f for value in node.values for f in CohortSelector.__get_pushdown_filters__(value)]
+        if not isinstance(node, ast.Compare):
+            return []
+
+        ops = {ast.Lt: '<', ast.LtE: '<=', ast.Gt: '>', ast.GtE: '>=', ast.Eq: '==', ast.In: 'in'}
+        flipped = {'<': '>', '<=': '>=', '>': '<', '>=': '<=', '==': '=='}
+        filters = []
+        operands = [node.left] + node.comparators
+        # a chained comparison holds only if each of its comparisons holds
+        for left, op, right in zip(operands[:-1], node.ops, operands[1:]):
+            op = ops.get(type(op))
+            if op is None:
+                continue
+            if isinstance(left, ast.Name):
+                field, value = left.id, right
+            elif isinstance(right, ast.Name) and op != 'in':
+                field, value, op = right.id, left, flipped[op]
+            else:
+                continue
+            try:
+                value = CohortSelector.__eval_constant__(value)
+            except (ValueError, TypeError, ArithmeticError):
+                continue
+            if isinstance(value, list):
+                # as in DataFrame.query(), comparing to a list with == is a membership test
+                if op in ['==', 'in'] and all(v is not None for v in value):
+                    filters.append((field, 'in', tuple(value)))
+            elif op != 'in' and isinstance(value, (str, int, float)) and value == value:
+                filters.append((field, op, value))
+        return filters
+
+    @staticmethod
+    def __eval_constant__(node: ast.AST) -> Any:
+        """
+        Evaluate a constant expression: a number, a string, a list of constants, or arithmetic on numbers.
+        Raises ValueError for any other expression.
+        """
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return [CohortSelector.__eval_constant__(e) for e in node.elts]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = CohortSelector.__eval_constant__(node.operand)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value if isinstance(node.op, ast.USub) else value
+        binary_ops = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+                      ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod}
+        if isinstance(node, ast.BinOp) and type(node.op) in binary_ops:
+            left = CohortSelector.__eval_constant__(node.left)
+            right = CohortSelector.__eval_constant__(node.right)
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in [left, right]):
+                return binary_ops[type(node.op)](left, right)
+        raise ValueError(f'Not a constant: {ast.dump(node)}')
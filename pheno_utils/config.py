@@ -3,9 +3,11 @@
 # %% auto 0
 __all__ = ['DEFAULT_PALETTE', 'REF_COLOR', 'FEMALE_COLOR', 'MALE_COLOR', 'ALL_COLOR', 'GLUC_COLOR', 'FOOD_COLOR', 'LEGEND_SHIFT',
            'TIME_FORMAT', 'DATASETS_PATH', 'COHORT', 'EVENTS_DATASET', 'ERROR_ACTION', 'CONFIG_FILES', 'BULK_DATA_PATH',
-           'PREFERRED_LANGUAGE', 'config_found', 'DICT_PROPERTY_PATH', 'DATA_CODING_PATH', 'copy_tre_config',
-           'get_dictionary_properties_file_path', 'get_data_coding_file_path', 'generate_synthetic_data',
-           'generate_synthetic_data_like', 'generate_categorical_synthetic_data']
+           'PREFERRED_LANGUAGE', 'N_JOBS', 'CACHE_PATH', 'CACHE_SIZE', 'RESULT_CACHE_SIZE', 'RESULT_CACHE_MEMORY',
+           'DTYPE_BACKEND', 'COMPACT_DTYPES', 'LOADER_POOL_SIZE', 'PROFILE_BINS', 'PROFILE_SKETCH_SIZE', 'config_found',
+           'DICT_PROPERTY_PATH', 'DATA_CODING_PATH', 'copy_tre_config', 'get_dictionary_properties_file_path',
+           'get_data_coding_file_path', 'generate_synthetic_data', 'generate_synthetic_data_like',
+           'generate_categorical_synthetic_data']
 
 # %% ../nbs/00_config.ipynb 3
 import os
@@ -35,6 +37,16 @@ ERROR_ACTION = 'raise'
 CONFIG_FILES = ['.pheno/config.json', '~/.pheno/config.json', '/efs/.pheno/config.json']
 BULK_DATA_PATH = {}
 PREFERRED_LANGUAGE = 'english'
+N_JOBS = 1
+CACHE_PATH = None
+CACHE_SIZE = 10 * 2**30
+RESULT_CACHE_SIZE = 0
+RESULT_CACHE_MEMORY = 2**30
+DTYPE_BACKEND = None
+COMPACT_DTYPES = None
+LOADER_POOL_SIZE = 8
+PROFILE_BINS = 64
+PROFILE_SKETCH_SIZE = 1024
 
 config_found = False
 
@@ -104,6 +116,26 @@ for cf in CONFIG_FILES:
             COHORT = None
     if 'ERROR_ACTION' in config:
         ERROR_ACTION = config['ERROR_ACTION']
+    if 'N_JOBS' in config:
+        N_JOBS = config['N_JOBS']
+    if 'CACHE_PATH' in config:
+        CACHE_PATH = config['CACHE_PATH']
+    if 'CACHE_SIZE' in config:
+        CACHE_SIZE = config['CACHE_SIZE']
+    if 'RESULT_CACHE_SIZE' in config:
+        RESULT_CACHE_SIZE = config['RESULT_CACHE_SIZE']
+    if 'RESULT_CACHE_MEMORY' in config:
+        RESULT_CACHE_MEMORY = config['RESULT_CACHE_MEMORY']
+    if 'DTYPE_BACKEND' in config:
+        DTYPE_BACKEND = config['DTYPE_BACKEND']
+    if 'COMPACT_DTYPES' in config:
+        COMPACT_DTYPES = config['COMPACT_DTYPES']
+    if 'LOADER_POOL_SIZE' in config:
+        LOADER_POOL_SIZE = config['LOADER_POOL_SIZE']
+    if 'PROFILE_BINS' in config:
+        PROFILE_BINS = config['PROFILE_BINS']
+    if 'PROFILE_SKETCH_SIZE' in config:
+        PROFILE_SKETCH_SIZE = config['PROFILE_SKETCH_SIZE']
     break
 
 
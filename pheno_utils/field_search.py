@@ -0,0 +1,375 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/18_field_search.ipynb.
+
+# %% auto 0
+__all__ = ['FieldSearchIndex']
+
+# %% ../nbs/18_field_search.ipynb 3
+import re
+import bisect
+import threading
+from typing import List, Dict, Union
+
+import numpy as np
+import pandas as pd
+
+# %% ../nbs/18_field_search.ipynb 4
+class FieldSearchIndex:
+    """
+    A search index over the field names and properties of a data dictionary, to find fields by regex
+    patterns, rank them and autocomplete them without scanning the whole dictionary.
+    Each property is indexed on first use by the trigrams of its values. The longest literal substring
+    of a pattern narrows down the candidate fields, and only the candidates are matched with the pattern,
+    so results are the same as applying re.search() to every field.
+    Free-text queries are ranked by BM25 over the words of the name, label, description and type of fields
+    (see text_props), using an inverted index that is built on first use.
+
+    Args:
+
+        dictionary (pd.DataFrame): The data dictionary, with a row per field and a column per property.
+            Field names are taken from the tabular_field_name index level (or column).
+        lowercase (bool, optional): Whether to lowercase the values of properties before searching them. Defaults to False.
+
+    Attributes:
+
+        dictionary (pd.DataFrame): The data dictionary.
+        lowercase (bool): Whether to lowercase the values of properties before searching them.
+        text_props (dict): The properties searched by search(), with the weight of their words.
+    """
+    ngram = 3
+    token_pattern = re.compile(r'[^\W_]+')
+    text_props = {'tabular_field_name': 1.0, 'field_string': 2.0, 'description_string': 1.0,
+                  'field_type': 0.5, 'data_type': 0.5}
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(
+        self,
+        dictionary: pd.DataFrame,
+        lowercase: bool = False
+    ) -> None:
+        self.dictionary = dictionary
+        self.lowercase = lowercase
+        self.__props__ = {}
+        self.__bm25__ = None
+        self.__lock__ = threading.Lock()
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f'FieldSearchIndex of {len(self.dictionary)} fields, indexed properties: {list(self.__props__)}'
+
+    def __len__(self) -> int:
+        return len(self.dictionary)
+
+    def match(self, pattern: str, prop: str = 'tabular_field_name', case: bool = True) -> list:
+        """
+        Find the fields whose property matches a regex pattern (as in re.search), in the order of the dictionary.
+
+        Args:
+            pattern (str): The regex pattern.
+            prop (str, optional): The property to search in. Defaults to 'tabular_field_name'.
+            case (bool, optional): Whether the search is case sensitive. Defaults to True.
+
+        Returns:
+            list: The index entries of the matching fields.
+        """
+        entry = self.__get_prop__(prop)
+        regex = re.compile(pattern, 0 if case else re.IGNORECASE)
+        ids = [i for i in self.__get_candidates__(entry, pattern) if regex.search(entry['texts'][i])]
+        return entry['keys'][ids].tolist()
+
+    def find(self, pattern: str, prop: str = 'tabular_field_name', case: bool = False, top_k: int = None) -> list:
+        """
+        Find the fields whose property matches a regex pattern, ranked by how well they match:
+        exact matches first, then matches at the start of the property, then by the position
+        of the match and the length of the property.
+
+        Args:
+            pattern (str): The regex pattern.
+            prop (str, optional): The property to search in. Defaults to 'tabular_field_name'.
+            case (bool, optional): Whether the search is case sensitive. Defaults to False.
+            top_k (int, optional): The maximal number of fields to return. Defaults to None (all matches).
+
+        Returns:
+            list: The index entries of the matching fields, from best to worst.
+        """
+        entry = self.__get_prop__(prop)
+        regex = re.compile(pattern, 0 if case else re.IGNORECASE)
+        ranks = []
+        for i in self.__get_candidates__(entry, pattern):
+            text = entry['texts'][i]
+            m = regex.search(text)
+            if m is None:
+                continue
+            kind = 0 if m.start() == 0 and m.end() == len(text) else 1 if m.start() == 0 else 2
+            ranks.append((kind, m.start(), len(text), i))
+        ids = [r[-1] for r in sorted(ranks)[:top_k]]
+        return entry['keys'][ids].tolist()
+
+    def complete(self, prefix: str, prop: str = 'tabular_field_name', top_k: int = 10) -> list:
+        """
+        Autocomplete a prefix (case insensitive). Fields whose property starts with the prefix come first,
+        followed by fields where any word of the property starts with the prefix, shorter properties first.
+
+        Args:
+            prefix (str): The prefix.
+            prop (str, optional): The property to complete. Defaults to 'tabular_field_name'.
+            top_k (int, optional): The maximal number of fields to return. Defaults to 10 (None returns all).
+
+        Returns:
+            list: The index entries of the completed fields, from best to worst.
+        """
+        entry = self.__get_prop__(prop)
+        prefix = prefix.casefold()
+        prefixes = entry['prefixes']
+        best = {}
+        for j in range(bisect.bisect_left(prefixes, (prefix,)), len(prefixes)):
+            text, kind, i = prefixes[j]
+            if not text.startswith(prefix):
+                break
+            best[i] = min(kind, best.get(i, kind))
+        ids = sorted(best, key=lambda i: (best[i], len(entry['texts'][i]), i))[:top_k]
+        return entry['keys'][ids].tolist()
+
+    def search(self, query: str, top_k: int = 10) -> pd.Series:
+        """
+        Rank fields by the BM25 score of a free-text query over the words of their properties (see text_props).
+        Words are matched case insensitively, and words in labels weigh more than in other properties.
+
+        Args:
+            query (str): The query, e.g., 'fasting glucose'.
+            top_k (int, optional): The maximal number of fields to return. Defaults to 10 (None returns all).
+
+        Returns:
+            pd.Series: The scores of the matching fields, from best to worst, indexed by their index entries.
+        """
+        bm25 = self.__get_bm25__()
+        scores = np.zeros(len(self.dictionary), dtype=np.float32)
+        terms = bm25['terms'].get_indexer(list(dict.fromkeys(self.__tokenize__(query))))
+        for j in terms[terms >= 0]:
+            start, end = bm25['offsets'][j], bm25['offsets'][j + 1]
+            scores[bm25['docs'][start:end]] += bm25['weights'][start:end]
+        ids = np.flatnonzero(scores)
+        ids = ids[np.lexsort((ids, -scores[ids]))][:top_k]
+        keys = np.asarray(self.dictionary.index, dtype=object)[ids]
+        return pd.Series(scores[ids], index=pd.Index(keys.tolist(), tupleize_cols=False), name='score')
+
+    def get_postings(self) -> pd.DataFrame:
+        """
+        Get the postings of the inverted index used by search(), e.g., to store them in a cache.
+
+        Returns:
+            pd.DataFrame: The term (categorical), row number (doc) and BM25 weight of every word in every field.
+        """
+        bm25 = self.__get_bm25__()
+        counts = np.diff(bm25['offsets'])
+        terms = pd.Categorical.from_codes(np.repeat(np.arange(len(counts)), counts), categories=bm25['terms'])
+        return pd.DataFrame({'term': terms, 'doc': bm25['docs'], 'weight': bm25['weights']})
+
+    def set_postings(self, postings: pd.DataFrame) -> None:
+        """
+        Set the postings of the inverted index used by search(), instead of building it.
+
+        Args:
+            postings (pd.DataFrame): The postings, as returned by get_postings() for the same dictionary.
+        """
+        with self.__lock__:
+            self.__bm25__ = self.__get_inverted_index__(postings)
+
+    def __get_bm25__(self) -> Dict[str, Union[pd.Index, np.ndarray]]:
+        """
+        Get the inverted index of the words of the text properties, and build it on first use.
+        The BM25 weight of each word in each field is computed when the index is built.
+        """
+        with self.__lock__:
+            if self.__bm25__ is not None:
+                return self.__bm25__
+            n_docs = len(self.dictionary)
+            lengths = np.zeros(n_docs)
+            vocabulary = {}
+            postings = [pd.DataFrame({'term': np.array([], dtype=np.int64), 'doc': np.array([], dtype=np.int64), 'tf': []})]
+            for prop, weight in self.text_props.items():
+                if prop in self.dictionary.columns:
+                    values = self.dictionary[prop]
+                elif prop in self.dictionary.index.names:
+                    values = self.dictionary.index.get_level_values(prop)
+                else:
+                    continue
+                # repeated values (e.g., types) are tokenized once
+                codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+                tokens = [self.__tokenize__(v) if isinstance(v, str) else [] for v in uniques]
+                counts = np.array([len(t) for t in tokens] + [0])
+                lengths += weight * counts[codes]
+                words = pd.DataFrame({'value': np.repeat(np.arange(len(tokens)), counts[:-1]),
+                                      'term': [vocabulary.setdefault(w, len(vocabulary)) for t in tokens for w in t]})
+                words = words.merge(pd.DataFrame({'value': codes, 'doc': np.arange(n_docs)}), on='value')
+                postings.append(words[['term', 'doc']].assign(tf=weight))
+            postings = pd.concat(postings, ignore_index=True)
+
+            # postings are sorted by term and field, and the weights of repeated words are summed
+            terms = np.array(list(vocabulary), dtype=object)
+            order = np.argsort(terms)
+            ranks = np.empty(len(terms), dtype=np.int64)
+            ranks[order] = np.arange(len(terms))
+            keys, inverse = np.unique(ranks[postings['term'].values] * n_docs + postings['doc'].values, return_inverse=True)
+            tf = np.bincount(inverse, weights=postings['tf'].values)
+            term_codes, docs = keys // n_docs, keys % n_docs
+
+            n_terms = np.bincount(term_codes, minlength=len(terms))[term_codes]
+            idf = np.log(1 + (n_docs - n_terms + 0.5) / (n_terms + 0.5))
+            norm = 1 - self.b + self.b * lengths[docs] / max(lengths.mean(), 1e-9)
+            postings = pd.DataFrame({
+                'term': pd.Categorical.from_codes(term_codes, categories=pd.Index(terms[order], dtype=object)),
+                'doc': docs,
+                'weight': idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+            })
+            self.__bm25__ = self.__get_inverted_index__(postings)
+            return self.__bm25__
+
+    @staticmethod
+    def __get_inverted_index__(postings: pd.DataFrame) -> Dict[str, Union[pd.Index, np.ndarray]]:
+        """
+        Convert postings that are sorted by term to an inverted index, with the postings of the j-th term
+        between offsets[j] and offsets[j + 1].
+        """
+        codes = postings['term'].cat.codes.values
+        terms = postings['term'].cat.categories
+        return {
+            'terms': pd.Index(terms, dtype=object),
+            'offsets': np.searchsorted(codes, np.arange(len(terms) + 1)),
+            'docs': postings['doc'].values.astype(np.int32),
+            'weights': postings['weight'].values.astype(np.float32)
+        }
+
+    @classmethod
+    def __tokenize__(cls, text: str) -> List[str]:
+        return cls.token_pattern.findall(text.casefold())
+
+    def __get_prop__(self, prop: str) -> Dict[str, Union[list, np.ndarray, dict]]:
+        """
+        Get the index of a property, and build it on first use.
+        """
+        with self.__lock__:
+            if prop in self.__props__:
+                return self.__props__[prop]
+            if prop in self.dictionary.columns:
+                values = self.dictionary[prop]
+            else:
+                values = self.dictionary.index.get_level_values(prop)  # raises KeyError for unknown properties
+            texts = [(v.lower() if self.lowercase else v) if isinstance(v, str) else None for v in values]
+
+            ids = []
+            grams = {}
+            unindexed = []
+            prefixes = []
+            for i, text in enumerate(texts):
+                if text is None:
+                    continue
+                ids.append(i)
+                folded = text.casefold()
+                prefixes.append((folded, 0, i))
+                prefixes += [(word, 1, i) for word in set(re.split(r'[\W_]+', folded)) if word]
+                if not text.isascii():
+                    # non-ASCII characters may match ASCII literals when ignoring case
+                    unindexed.append(i)
+                    continue
+                for gram in {folded[j:j + self.ngram] for j in range(len(folded) - self.ngram + 1)}:
+                    grams.setdefault(gram, []).append(i)
+
+            self.__props__[prop] = {
+                'keys': np.asarray(self.dictionary.index, dtype=object),
+                'texts': texts,
+                'ids': ids,
+                'grams': {gram: np.array(g, dtype=int) for gram, g in grams.items()},
+                'unindexed': np.array(unindexed, dtype=int),
+                'prefixes': sorted(prefixes)
+            }
+            return self.__props__[prop]
+
+    def __get_candidates__(self, entry: Dict[str, Union[list, np.ndarray, dict]], pattern: str) -> list:
+        """
+        Get the fields that may match a pattern, which are those that contain all the trigrams
+        of its longest literal substring, in the order of the dictionary.
+        """
+        literal = self.__get_literal__(pattern)
+        if len(literal) < self.ngram:
+            return entry['ids']
+        postings = [entry['grams'].get(literal[j:j + self.ngram]) for j in range(len(literal) - self.ngram + 1)]
+        if any(p is None for p in postings):
+            return entry['unindexed'].tolist()
+        candidates = postings[0]
+        for p in sorted(postings[1:], key=len):
+            candidates = np.intersect1d(candidates, p, assume_unique=True)
+        return np.union1d(candidates, entry['unindexed']).tolist()
+
+    @staticmethod
+    def __get_literal__(pattern: str) -> str:
+        """
+        Get the longest (case folded) ASCII literal substring that every match of a pattern must contain,
+        or an empty string if none was found. The pattern is scanned for runs of literal characters, and
+        any construct that cannot be planned (alternation, global flags, numeric escapes) falls back to a full scan.
+        """
+        if '|' in pattern or re.match(r'\(\?[aiLmsux]', pattern):
+            return ''
+        runs = ['']
+        i = 0
+        while i < len(pattern):
+            c = pattern[i]
+            if c == '\\':
+                nxt = pattern[i + 1:i + 2]
+                if nxt.isdigit() or nxt in ('x', 'u', 'U', 'N'):
+                    return ''  # escapes of variable length
+                i += 2
+                if nxt.isalnum() or not nxt.isascii():
+                    runs.append('')  # character classes, anchors and non-ASCII literals
+                else:
+                    runs[-1] += nxt
+                continue
+            if c == '[':
+                i = FieldSearchIndex.__skip_class__(pattern, i)
+                runs.append('')
+                continue
+            if c == '(':
+                depth = 0
+                while i < len(pattern):
+                    if pattern[i] == '\\':
+                        i += 2
+                        continue
+                    if pattern[i] == '[':
+                        i = FieldSearchIndex.__skip_class__(pattern, i)
+                        continue
+                    depth += {'(': 1, ')': -1}.get(pattern[i], 0)
+                    i += 1
+                    if depth == 0:
+                        break
+                runs.append('')
+                continue
+            quantifier = re.match(r'\{(\d*)(?:,\d*)?\}', pattern[i:]) if c == '{' else None
+            if c in '?*+' or quantifier is not None:
+                # the quantified character may be repeated, and optional unless it is required at least once
+                if c in '?*' or (quantifier is not None and int(quantifier.group(1) or 0) == 0):
+                    runs[-1] = runs[-1][:-1]
+                runs.append('')
+                i += len(quantifier.group(0)) if quantifier is not None else 1
+                continue
+            if c in '.^$' or not c.isascii():
+                runs.append('')
+            else:
+                runs[-1] += c
+            i += 1
+        return max(runs, key=len).casefold()
+
+    @staticmethod
+    def __skip_class__(pattern: str, i: int) -> int:
+        """
+        Get the position after the character class that starts at position i of a pattern.
+        """
+        i += 1
+        if pattern[i:i + 1] == '^':
+            i += 1
+        if pattern[i:i + 1] == ']':
+            i += 1  # a leading ] is a literal
+        while i < len(pattern) and pattern[i] != ']':
+            i += 2 if pattern[i] == '\\' else 1
+        return i + 1
@@ -0,0 +1,350 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/19_field_stats.ipynb.
+
+# %% auto 0
+__all__ = ['ThetaSketch', 'FieldProfile']
+
+# %% ../nbs/19_field_stats.ipynb 3
+import operator
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# %% ../nbs/19_field_stats.ipynb 4
+from pheno_utils.config import (
+    PROFILE_BINS,
+    PROFILE_SKETCH_SIZE
+    )
+
+# %% ../nbs/19_field_stats.ipynb 5
+class ThetaSketch:
+    """
+    A theta sketch of a set of keys (e.g., participants or visits), to estimate the sizes of sets and of
+    their unions, intersections and differences without keeping all their keys. A sketch keeps the 64-bit
+    hashes of keys up to a maximal hash, which is chosen such that at most k hashes are kept. The fraction
+    of the range of hashes that is kept (theta) scales the number of kept hashes to the size of the set.
+    Sketches of sets with at most k keys keep all their hashes, and their sizes are exact.
+
+    Args:
+
+        hashes (np.ndarray): The sorted unique hashes of the keys, up to the maximal hash.
+        max_hash (int, optional): The maximal hash that is kept. Defaults to 2**64 - 1 (all hashes).
+
+    Attributes:
+
+        hashes (np.ndarray): The sorted unique hashes of the keys, up to the maximal hash.
+        max_hash (int): The maximal hash that is kept.
+    """
+    hash_range = 2**64
+
+    def __init__(
+        self,
+        hashes: np.ndarray,
+        max_hash: int = 2**64 - 1
+    ) -> None:
+        self.hashes = np.asarray(hashes, dtype=np.uint64)
+        self.max_hash = int(max_hash)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f'ThetaSketch of {len(self.hashes)} hashes (theta={self.theta:.3g}), estimated size {self.estimate():.1f}'
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def theta(self) -> float:
+        return (self.max_hash + 1) / self.hash_range
+
+    @property
+    def is_exact(self) -> bool:
+        return self.max_hash >= self.hash_range - 1
+
+    @classmethod
+    def empty(cls) -> 'ThetaSketch':
+        return cls(np.array([], dtype=np.uint64))
+
+    @classmethod
+    def from_keys(cls, keys: Union[pd.Index, np.ndarray], k: int = PROFILE_SKETCH_SIZE) -> 'ThetaSketch':
+        """
+        Build the sketch of a set of keys.
+
+        Args:
+            keys (Union[pd.Index, np.ndarray]): The keys, with repetitions. Keys of a MultiIndex are
+                hashed together (e.g., participant and research stage).
+            k (int, optional): The maximal number of hashes to keep. Defaults to PROFILE_SKETCH_SIZE (None keeps all).
+
+        Returns:
+            ThetaSketch: The sketch.
+        """
+        return cls.from_hashes(cls.hash_keys(keys), k)
+
+    @classmethod
+    def from_hashes(cls, hashes: np.ndarray, k: int = PROFILE_SKETCH_SIZE) -> 'ThetaSketch':
+        """
+        Build the sketch of a set of hashed keys (see hash_keys()), keeping the k smallest hashes.
+        """
+        hashes = np.unique(np.asarray(hashes, dtype=np.uint64))
+        if k is None or len(hashes) <= k:
+            return cls(hashes)
+        return cls(hashes[:k], int(hashes[k]) - 1)
+
+    @staticmethod
+    def hash_keys(keys: Union[pd.Index, np.ndarray]) -> np.ndarray:
+        """
+        Hash keys to 64 bits, such that equal keys have equal hashes in all tables and sessions.
+        Integer keys are hashed as 64-bit integers and other keys by their values, whatever their dtype.
+        """
+        index = keys if isinstance(keys, pd.MultiIndex) else pd.MultiIndex.from_arrays([keys])
+        levels = pd.DataFrame({i: np.asarray(index.get_level_values(i), dtype='int64')
+                               if pd.api.types.is_integer_dtype(index.levels[i].dtype)
+                               else np.asarray(index.get_level_values(i), dtype=object)
+                               for i in range(index.nlevels)})
+        return pd.util.hash_pandas_object(levels, index=False).to_numpy()
+
+    def estimate(self) -> float:
+        """
+        Estimate the number of keys in the set.
+        """
+        return len(self.hashes) / self.theta
+
+    def bounds(self, z: float = 2.0) -> Tuple[float, float]:
+        """
+        Get bounds of the number of keys in the set, of about z standard deviations of the estimate.
+        """
+        estimate = self.estimate()
+        if self.is_exact:
+            return estimate, estimate
+        deviation = z * np.sqrt(estimate * (1 - self.theta) / self.theta)
+        return max(float(len(self.hashes)), estimate - deviation), estimate + deviation
+
+    def union(self, *others: 'ThetaSketch') -> 'ThetaSketch':
+        """
+        Get the sketch of the union of sets.
+        """
+        max_hash = min(s.max_hash for s in (self,) + others)
+        hashes = np.unique(np.concatenate([s.__get_hashes__(max_hash) for s in (self,) + others]))
+        return ThetaSketch(hashes, max_hash)
+
+    def intersection(self, *others: 'ThetaSketch') -> 'ThetaSketch':
+        """
+        Get the sketch of the intersection of sets.
+        """
+        max_hash = min(s.max_hash for s in (self,) + others)
+        hashes = self.__get_hashes__(max_hash)
+        for other in others:
+            hashes = np.intersect1d(hashes, other.__get_hashes__(max_hash), assume_unique=True)
+        return ThetaSketch(hashes, max_hash)
+
+    def difference(self, other: 'ThetaSketch') -> 'ThetaSketch':
+        """
+        Get the sketch of the keys in this set that are not in another set.
+        """
+        max_hash = min(self.max_hash, other.max_hash)
+        return ThetaSketch(np.setdiff1d(self.__get_hashes__(max_hash), other.__get_hashes__(max_hash),
+                                        assume_unique=True), max_hash)
+
+    def sample(self, fraction: float) -> 'ThetaSketch':
+        """
+        Get the sketch of a random subset of the set, with about a fraction of its keys.
+        Keys are sampled by the low bits of their hashes, so samples of the same fraction agree across sets.
+        """
+        low_bits = (self.hashes & np.uint64(2**32 - 1)).astype(np.float64)
+        return ThetaSketch(self.hashes[low_bits < fraction * 2**32], self.max_hash)
+
+    def __get_hashes__(self, max_hash: int) -> np.ndarray:
+        """
+        Get the kept hashes up to a maximal hash.
+        """
+        if max_hash >= self.max_hash:
+            return self.hashes
+        return self.hashes[self.hashes <= np.uint64(max_hash)]
+
+# %% ../nbs/19_field_stats.ipynb 8
+class FieldProfile:
+    """
+    A summary of the values of a field, to estimate how many participants and visits have values that match
+    conditions on the field without reading its data. Values are split into (at most) n_bins bins with about
+    equal numbers of rows, where all the rows of a value fall in the same bin. Each bin keeps the range and the
+    number of its distinct values, its number of rows, and sketches of its participants and visits (ThetaSketch).
+    Fields with at most n_bins distinct values have a bin per value, so conditions on them are counted exactly.
+    A last bin holds the rows with missing values.
+
+    Args:
+
+        bins (pd.DataFrame): The bins, as built by from_values().
+
+    Attributes:
+
+        bins (pd.DataFrame): A row per bin, with its min and max values, its number of distinct values and rows, and the
+            hashes and maximal hash of the sketches of its participants and (if research stages are known) visits.
+    """
+    keys = ['participants', 'visits']
+
+    def __init__(
+        self,
+        bins: pd.DataFrame
+    ) -> None:
+        self.bins = bins
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return f'FieldProfile of {int(self.bins["rows"].sum())} rows in {len(self.bins) - 1} bins'
+
+    @classmethod
+    def from_values(cls, values: pd.Series, n_bins: int = PROFILE_BINS, k: int = PROFILE_SKETCH_SIZE) -> 'FieldProfile':
+        """
+        Build the profile of a field from its values.
+
+        Args:
+            values (pd.Series): The values of the field, indexed by participant_id and (optionally) research_stage.
+            n_bins (int, optional): The maximal number of bins of values. Defaults to PROFILE_BINS.
+            k (int, optional): The maximal number of hashes in each sketch. Defaults to PROFILE_SKETCH_SIZE.
+
+        Returns:
+            FieldProfile: The profile.
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        valid = values.notnull().to_numpy()
+        try:
+            codes, uniques = pd.factorize(values[valid], sort=True)
+        except TypeError:
+            # values of mixed types are ordered by their text
+            codes, uniques = pd.factorize(values[valid].astype(str), sort=True)
+        counts = np.bincount(codes, minlength=len(uniques))
+        if len(uniques) <= n_bins:
+            unique_bins = np.arange(len(uniques))
+        else:
+            unique_bins = (np.cumsum(counts) - counts) * n_bins // len(codes)
+            unique_bins = np.unique(unique_bins, return_inverse=True)[1]
+        n_value_bins = unique_bins[-1] + 1 if len(uniques) else 0
+        row_bins = np.full(len(values), n_value_bins)
+        row_bins[valid] = unique_bins[codes]
+
+        first = np.searchsorted(unique_bins, np.arange(n_value_bins))
+        last = np.r_[first[1:], len(uniques)][:n_value_bins] - 1
+        bins = pd.DataFrame({
+            'min': pd.Series(uniques.take(first)).reindex(range(n_value_bins + 1)),
+            'max': pd.Series(uniques.take(last)).reindex(range(n_value_bins + 1)),
+            'values': np.r_[last - first + 1, 0],
+            'rows': np.bincount(row_bins, minlength=n_value_bins + 1)
+        })
+
+        # the rows of each bin are sketched together, after sorting them by bin
+        order = np.argsort(row_bins, kind='stable')
+        splits = np.cumsum(bins['rows'].to_numpy())[:-1]
+        index = values.index
+        keys = {'participants': index.get_level_values('participant_id')}
+        if 'research_stage' in index.names:
+            keys['visits'] = index.droplevel([name for name in index.names if name not in ['participant_id', 'research_stage']])
+        for key, key_index in keys.items():
+            hashes = ThetaSketch.hash_keys(key_index)[order]
+            sketches = [ThetaSketch.from_hashes(h, k) for h in np.split(hashes, splits)]
+            bins[key] = [s.hashes for s in sketches]
+            bins[f'{key}_max_hash'] = np.array([s.max_hash for s in sketches], dtype=np.uint64)
+        return cls(bins)
+
+    def has_key(self, key: str) -> bool:
+        """
+        Whether the profile has sketches of a key ('participants' or 'visits').
+        """
+        return key in self.bins.columns
+
+    def get_sketch(self, key: str, bins: np.ndarray = None) -> ThetaSketch:
+        """
+        Get the sketch of the participants or visits of some bins.
+
+        Args:
+            key (str): 'participants' or 'visits'.
+            bins (np.ndarray, optional): A boolean mask of the bins. Defaults to None (all bins).
+
+        Returns:
+            ThetaSketch: The sketch of the union of the bins.
+        """
+        sketches = [ThetaSketch(hashes, max_hash) for hashes, max_hash, selected in
+                    zip(self.bins[key], self.bins[f'{key}_max_hash'], np.ones(len(self.bins), dtype=bool) if bins is None else bins)
+                    if selected]
+        if len(sketches) == 0:
+            return ThetaSketch.empty()
+        return ThetaSketch.union(*sketches)
+
+    def cover(self, op: str, value) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the fraction of the rows of each bin whose value matches a condition. Missing values never match.
+
+        Args:
+            op (str): The comparison: '<', '<=', '>', '>=', '==' or 'in'.
+            value: The value to compare to, or a list of values for 'in'.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: A lower bound, an estimate and an upper bound of the fraction of each bin.
+        """
+        bins = self.bins.iloc[:-1]
+        low, high, n_values = bins['min'], bins['max'], bins['values'].to_numpy()
+        if op in ['==', 'in']:
+            inside = np.zeros(len(bins))
+            for v in (value if op == 'in' else [value]):
+                try:
+                    v = self.__convert_value__(v, low.dtype)
+                    inside += np.asarray((low <= v) & (v <= high), dtype=bool)
+                except (TypeError, ValueError):
+                    continue  # values of other types never match
+            lower = ((n_values == 1) & (inside > 0)).astype(float)
+            estimate = np.minimum(1, inside / np.maximum(n_values, 1))
+            upper = (inside > 0).astype(float)
+        else:
+            value = self.__convert_value__(value, low.dtype)
+            compare = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}[op]
+            # a bin matches fully if both its ends match, and not at all if neither does
+            full = np.asarray(compare(low, value) & compare(high, value), dtype=bool)
+            none = ~np.asarray(compare(low, value) | compare(high, value), dtype=bool)
+            try:
+                position = np.asarray(((value - low) / (high - low)).astype(float)).clip(0, 1)
+            except (TypeError, ValueError):
+                position = np.full(len(bins), 0.5)
+            partial = np.nan_to_num(position if op in ['<', '<='] else 1 - position, nan=0.5)
+            lower = full.astype(float)
+            estimate = np.where(full, 1, np.where(none, 0, partial))
+            upper = (~none).astype(float)
+        return np.r_[lower, 0], np.r_[estimate, 0], np.r_[upper, 0]
+
+    def select(self, lower: np.ndarray, estimate: np.ndarray, upper: np.ndarray,
+               key: str = 'participants') -> Tuple[ThetaSketch, ThetaSketch, ThetaSketch]:
+        """
+        Get sketches of the participants or visits with rows that match a condition, given the fraction
+        of the rows of each bin that match it (see cover()).
+
+        Args:
+            lower (np.ndarray): A lower bound of the fraction of each bin.
+            estimate (np.ndarray): An estimate of the fraction of each bin.
+            upper (np.ndarray): An upper bound of the fraction of each bin.
+            key (str, optional): 'participants' or 'visits'. Defaults to 'participants'.
+
+        Returns:
+            Tuple[ThetaSketch, ThetaSketch, ThetaSketch]: Sketches of the participants (or visits) of bins that
+                match fully, an estimate that includes a sample of each partially matching bin, and of bins that may match.
+        """
+        partial = [self.get_sketch(key, np.arange(len(self.bins)) == i).sample(estimate[i])
+                   for i in np.flatnonzero((estimate > 0) & (estimate < 1))]
+        full = self.get_sketch(key, lower >= 1)
+        return full, ThetaSketch.union(self.get_sketch(key, estimate >= 1), *partial), self.get_sketch(key, upper > 0)
+
+    @staticmethod
+    def __convert_value__(value, dtype):
+        """
+        Convert a value to compare to the values of a field, as in DataFrame.query() (e.g., text to dates).
+        """
+        if not pd.api.types.is_datetime64_any_dtype(dtype):
+            return value
+        value = pd.Timestamp(value)
+        tz = getattr(dtype, 'tz', None)
+        if tz is not None and value.tz is None:
+            return value.tz_localize(tz)
+        if tz is None and value.tz is not None:
+            return value.tz_convert(None)
+        return value
@@ -6,20 +6,33 @@ __all__ = ['MetaLoader']
 # %% ../nbs/11_meta_loader.ipynb 3
 import os
 import re
-from typing import List, Any, Dict, Union
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+import threading
+from typing import Callable, List, Any, Dict, Union
 import warnings
 
 import numpy as np
 import pandas as pd
-import dask.dataframe as dd
 
 # %% ../nbs/11_meta_loader.ipynb 4
 from pheno_utils.config import (
     DATASETS_PATH, 
     COHORT, 
-    ERROR_ACTION
+    ERROR_ACTION,
+    DTYPE_BACKEND,
+    LOADER_POOL_SIZE,
+    CACHE_PATH,
+    CACHE_SIZE,
+    PROFILE_BINS,
+    PROFILE_SKETCH_SIZE
     )
 from .pheno_loader import PhenoLoader
+from .cache import TableCache, get_file_fingerprint, metadata_registry
+from .field_search import FieldSearchIndex
+from .field_stats import FieldProfile
 
 
 # %% ../nbs/11_meta_loader.ipynb 5
@@ -34,6 +47,14 @@ class MetaLoader:
         flexible_field_search (bool, optional): Whether to allow regex field search. Defaults to False.
         errors (str, optional): Whether to raise an error or issue a warning if missing data is encountered.
             Possible values are 'raise', 'warn' and 'ignore'. Defaults to 'raise'.
+        dtype_backend (str, optional): The backend of the dtypes of loaded columns. Use 'pyarrow' to keep columns Arrow-backed.
+            Defaults to DTYPE_BACKEND (None uses NumPy dtypes).
+        pool_size (int, optional): The maximal number of per-dataset loaders kept warm between calls to load().
+            The least recently used loader is dropped first. Use 0 to create new loaders on every call. Defaults to LOADER_POOL_SIZE.
+        cache_path (str, optional): The directory of the on-disk cache, where a catalog of all dictionaries is kept and
+            refreshed only for dictionaries that changed. Also used by the loaders of the datasets. Defaults to CACHE_PATH.
+            The cache is opt-in: CACHE_PATH is None unless set in config.json, and without a cache all dictionaries are parsed on startup.
+        cache_size (int, optional): The maximum size of the on-disk cache in bytes. Defaults to CACHE_SIZE.
         **kwargs: Additional keyword arguments to pass to a DataLoader class.
 
     Attributes:
@@ -44,6 +65,10 @@ class MetaLoader:
         base_path (str): The base path where the data is stored.
         flexible_field_search (bool): Whether to allow regex field search.
         errors (str): Whether to raise an error or issue a warning if missing data is encountered.
+        dtype_backend (str): The backend of the dtypes of loaded columns.
+        pool_size (int): The maximal number of per-dataset loaders kept warm between calls to load().
+        loaders (OrderedDict): The warm per-dataset loaders, from the least to the most recently used.
+        cache (TableCache): The on-disk cache of the catalog of dictionaries, or None if disabled.
         kwargs (dict): Additional keyword arguments to pass to a DataLoader class.
     """
 
@@ -53,6 +78,10 @@ class MetaLoader:
         cohort: str = COHORT,
         flexible_field_search: bool = False,
         errors: str = ERROR_ACTION,
+        dtype_backend: str = DTYPE_BACKEND,
+        pool_size: int = LOADER_POOL_SIZE,
+        cache_path: str = CACHE_PATH,
+        cache_size: int = CACHE_SIZE,
         **kwargs,
     ) -> None:
         self.cohort = cohort
@@ -61,11 +90,23 @@ class MetaLoader:
         
         self.flexible_field_search = flexible_field_search
         self.errors = errors
+        self.dtype_backend = dtype_backend
+        self.pool_size = pool_size
+        self.loaders = OrderedDict()
+        self.__pool_lock__ = threading.Lock()
+        self.__loader_locks__ = {}
+        self.__profiles__ = {}
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.cache = None
+        if cache_path is not None:
+            self.cache = TableCache(cache_path, cache_size)
         self.kwargs = kwargs
 
         self.__load_dictionaries__()
 
-    def load(self, fields: Union[str,List[str]], flexible: bool=None, prop: str='tabular_field_name') -> pd.DataFrame:
+    def load(self, fields: Union[str,List[str]], flexible: bool=None, prop: str='tabular_field_name',
+             filters: Union[dict, List[tuple]]=None, output_format: str='pandas') -> pd.DataFrame:
         """
         Return a dataframe containing the fields from the respective datasets.
 
@@ -73,10 +114,28 @@ class MetaLoader:
             fields (Union[str,List[str]]): Fields to return
             flexible (bool, optional): Whether to use fuzzy matching to find fields. Defaults to None, which uses the DataLoader's flexible_field_search attribute.
             prop (str, optional): The property to use for searching. Defaults to 'tabular_field_name'.
+            filters (Union[dict, List[tuple]], optional): Filters on the rows of each dataset, as in PhenoLoader.get(),
+                which are pushed down to the dataset of their field. Fields may be given as dataset/field, and
+                otherwise must be found in exactly one dataset. Filters on participant_id apply to all datasets.
+                Defaults to None.
+            output_format (str, optional): The type of the returned data: 'pandas', 'arrow' for a pyarrow.Table,
+                or 'batches' for a pyarrow.RecordBatchReader. Defaults to 'pandas'.
 
         Returns:
             pd.DataFrame: Dataframe containing the fields from the respective datasets.
         """
+        if output_format not in ['pandas', 'arrow', 'batches']:
+            raise ValueError(f"output_format must be 'pandas', 'arrow' or 'batches', got {output_format}")
+        loaded_fields = self.__load_fields__(fields, flexible, prop, filters)
+        if output_format == 'pandas':
+            return loaded_fields
+        return PhenoLoader.__to_arrow__(loaded_fields, output_format)
+
+    def __load_fields__(self, fields: Union[str,List[str]], flexible: bool, prop: str,
+                        filters: Union[dict, List[tuple]]) -> pd.DataFrame:
+        """
+        Load the fields from the respective datasets and join them, with the arguments of load().
+        """
         found_fields = self.get(fields, flexible, prop)
         if found_fields.empty:
             return pd.DataFrame()
@@ -85,17 +144,25 @@ class MetaLoader:
         dup_fields = found_fields.columns.value_counts()\
             .to_frame('count').query('count > 1').index
         n_datasets = found_fields.loc['dataset'].nunique()
+        dataset_filters = self.__get_dataset_filters__(filters, found_fields.loc['dataset'])
+
+        # independent datasets are loaded concurrently, each by its own warm loader
+        datasets = [(ds, f.index.tolist()) for ds, f in found_fields.T.groupby('dataset')]
+        loaded = self.__map__(lambda item: self.__get_loader__(item[0])\
+            .get(item[1], filters=dataset_filters.get(item[0])), datasets)
 
         loaded_fields = []
-        for ds, f in found_fields.T.groupby('dataset'):
-            df = PhenoLoader(ds, base_path=self.base_path, cohort=self.cohort,
-                             age_sex_dataset=None, **self.kwargs)\
-                [f.index.tolist()]
-            if df.empty:
+        for (ds, _), df in zip(datasets, loaded):
+            # filtered datasets are kept even with no matching rows, so that their columns are returned
+            if df.empty and (ds not in dataset_filters or len(df.columns) == 0):
                 continue
 
             if 'array_index' in df.index.names and n_datasets > 1:
-                if df.index.get_level_values('array_index').nunique() > 1:
+                # filtered rows may not show all array indices, so arrays are also found by their metadata
+                is_array = df.index.get_level_values('array_index').nunique() > 1 or ds in dataset_filters and \
+                    'array' in found_fields.index and \
+                    (found_fields.loc['array', found_fields.loc['dataset'] == ds] == 'Multiple').any()
+                if is_array:
                     df = df.reset_index('array_index', drop=False)\
                         .rename(columns={'array_index': f'{ds}__array_index'})
                 else:
@@ -103,15 +170,130 @@ class MetaLoader:
 
             # rename duplicate fields
             df = df.rename(columns=pd.Series(f'{ds}__' + dup_fields, index=dup_fields))
+            loaded_fields.append(df)
+
+        return self.__join__(loaded_fields)
+
+    @staticmethod
+    def __get_dataset_filters__(filters: Union[dict, List[tuple]], field_datasets: pd.Series) -> Dict[str, List[tuple]]:
+        """
+        Assign the filters of load() to the datasets of their fields.
 
-            if not len(loaded_fields):
-                loaded_fields = df
+        Args:
+            filters (Union[dict, List[tuple]]): The filters, as in PhenoLoader.get().
+            field_datasets (pd.Series): The dataset of each loaded field, indexed by field name.
+
+        Returns:
+            Dict[str, List[tuple]]: The (field, op, value) filters of each dataset.
+        """
+        predicates = PhenoLoader.__get_filter_predicates__(filters)
+        dataset_filters = {}
+        for field, op, value in predicates or []:
+            if field == 'participant_id' and field not in field_datasets.index:
+                # participants are shared by all datasets
+                for dataset in field_datasets.unique():
+                    dataset_filters.setdefault(dataset, []).append((field, op, value))
                 continue
-        
-            
-            loaded_fields = loaded_fields.join(df, how='outer')
+            if '/' in field:
+                dataset, field = field.split('/', 1)
+                datasets = [dataset] if dataset in field_datasets.values else []
+            else:
+                datasets = field_datasets[field_datasets.index == field].unique().tolist()
+            if len(datasets) != 1:
+                raise ValueError(f'Filter on {field} must match a loaded field of exactly one dataset, found in {datasets}')
+            dataset_filters.setdefault(datasets[0], []).append((field, op, value))
+        return dataset_filters
 
-        return loaded_fields
+    def __get_loader__(self, dataset: str) -> PhenoLoader:
+        """
+        Get the loader of a dataset from the pool, or create it. Loaders read only the columns
+        of the requested fields, and keep them loaded for later calls.
+        A pooled loader is created at most once, and concurrent callers wait for it.
+
+        Args:
+            dataset (str): The name of the dataset.
+
+        Returns:
+            PhenoLoader: The loader of the dataset.
+        """
+        if not self.pool_size:
+            return self.__create_loader__(dataset)
+        with self.__pool_lock__:
+            if dataset in self.loaders:
+                self.loaders.move_to_end(dataset)
+                return self.loaders[dataset]
+            dataset_lock = self.__loader_locks__.setdefault(dataset, threading.Lock())
+
+        with dataset_lock:
+            # the loader may have been created while waiting for the lock
+            with self.__pool_lock__:
+                if dataset in self.loaders:
+                    self.loaders.move_to_end(dataset)
+                    return self.loaders[dataset]
+            loader = self.__create_loader__(dataset)
+            with self.__pool_lock__:
+                self.loaders[dataset] = loader
+                while len(self.loaders) > self.pool_size:
+                    self.loaders.popitem(last=False)
+        return loader
+
+    def __create_loader__(self, dataset: str) -> PhenoLoader:
+        """
+        Create the loader of a dataset.
+
+        Args:
+            dataset (str): The name of the dataset.
+
+        Returns:
+            PhenoLoader: The loader of the dataset.
+        """
+        kwargs = {'project_columns': True, **self.kwargs}
+        return PhenoLoader(dataset, base_path=self.base_path, cohort=self.cohort,
+                           age_sex_dataset=None, dtype_backend=self.dtype_backend,
+                           cache_path=self.cache_path, cache_size=self.cache_size, **kwargs)
+
+    def clear_loaders(self) -> None:
+        """
+        Drop all warm per-dataset loaders, and the data they hold.
+        """
+        with self.__pool_lock__:
+            self.loaders.clear()
+
+    @staticmethod
+    def __map__(func: Callable, items: list) -> list:
+        """
+        Apply a function to every item with a thread per item (up to the number of CPUs).
+        Results are returned in the order of the input.
+        """
+        n_jobs = min(len(items), os.cpu_count() or 1)
+        if n_jobs <= 1:
+            return list(map(func, items))
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(func, items))
+
+    @staticmethod
+    def __join__(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Outer join the data of all datasets. Tables with the same unique index are aligned
+        in a single multi-way join, otherwise they are joined one after the other.
+
+        Args:
+            dfs (List[pd.DataFrame]): The data of each dataset.
+
+        Returns:
+            pd.DataFrame: The joined data.
+        """
+        if len(dfs) == 0:
+            return pd.DataFrame()
+        if len(dfs) == 1:
+            return dfs[0]
+        index_names = dfs[0].index.names
+        if all(df.index.names == index_names and df.index.is_unique for df in dfs):
+            return pd.concat(dfs, axis=1, join='outer', sort=True)
+        joined = dfs[0]
+        for df in dfs[1:]:
+            joined = joined.join(df, how='outer')
+        return joined
 
     def get(self, fields: Union[str,List[str]], flexible: bool=None, prop='tabular_field_name') -> pd.DataFrame:
         """
@@ -136,20 +318,23 @@ class MetaLoader:
             fields.loc[ind, 'dataset'] = fields.loc[ind, 'field'].str.split('/').str[0]
             fields.loc[ind, 'field'] = fields.loc[ind, 'field'].str.split('/').str[1]
 
+        if flexible:
+            # use fuzzy matching including regex to find fields, where each pattern is searched once in all datasets
+            field_index = self.__get_field_index__()
+            matches = {f: field_index.match(f, prop) for f in fields['field'].unique()}
+
         data = pd.DataFrame()
         for dataset, df in self.dicts.items():
             keep = (fields['dataset'] == dataset) | fields['dataset'].isnull()
             fields_in_dataset = fields.loc[keep, 'field']
 
-            if prop == 'tabular_field_name':
-                search_in = pd.Series(df.columns, index=df.columns).str.lower()
-            else:
-                search_in = df.loc[prop].dropna().str.lower()
             if flexible:
-                # use fuzzy matching including regex to find fields
-                fields_in_col = np.unique([col for f in fields_in_dataset for col, text in search_in.items()
-                                           if type(text) is str and re.search(f, text)])
+                fields_in_col = np.unique([col for f in fields_in_dataset for ds, col in matches[f] if ds == dataset])
             else:
+                if prop == 'tabular_field_name':
+                    search_in = pd.Series(df.columns, index=df.columns).str.lower()
+                else:
+                    search_in = df.loc[prop].dropna().str.lower()
                 fields_in_col = search_in[search_in.isin(fields_in_dataset)].index
 
             if len(fields_in_col):
@@ -159,6 +344,128 @@ class MetaLoader:
 
         return data
 
+    def complete(self, prefix: str, prop: str = 'tabular_field_name', top_k: int = 10) -> List[str]:
+        """
+        Autocomplete a prefix of a field name (or of another property) in all datasets. Fields that start
+        with the prefix come first, followed by fields where any word starts with the prefix.
+
+        Args:
+            prefix (str): The prefix.
+            prop (str, optional): The property to complete. Defaults to 'tabular_field_name'.
+            top_k (int, optional): The maximal number of fields to return. Defaults to 10.
+
+        Returns:
+            List[str]: The completed fields, as dataset/field.
+        """
+        return [f'{dataset}/{field}' for dataset, field in self.__get_field_index__().complete(prefix, prop, top_k)]
+
+    def __get_field_index__(self) -> FieldSearchIndex:
+        """
+        Get the search index of the fields of all datasets, and build it on first use.
+        """
+        if self.__field_index__ is None:
+            dicts = pd.concat([df.T for df in self.dicts.values()], keys=list(self.dicts.keys()),
+                              names=['dataset', 'tabular_field_name'])
+            self.__field_index__ = FieldSearchIndex(dicts, lowercase=True)
+        return self.__field_index__
+
+    def search(self, query: str, top_k: int = 10) -> pd.DataFrame:
+        """
+        Rank the fields of all datasets by the BM25 score of a free-text query over the words of their
+        names, labels, descriptions and types. The inverted index is built on first use, and kept in the
+        on-disk cache (if enabled) until any dictionary changes.
+
+        Args:
+            query (str): The query, e.g., 'fasting glucose'.
+            top_k (int, optional): The maximal number of fields to return. Defaults to 10.
+
+        Returns:
+            pd.DataFrame: Metadata for the top fields, as in get(), from best to worst, with their score.
+        """
+        field_index = self.__get_field_index__()
+        if self.__search_key__ is not None:
+            cached = self.cache.get(self.__search_key__)
+            if cached is not None:
+                field_index.set_postings(cached[0])
+            else:
+                self.cache.put(self.__search_key__, field_index.get_postings())
+            self.__search_key__ = None
+        scores = field_index.search(query, top_k)
+        if scores.empty:
+            return pd.DataFrame()
+
+        data = pd.concat({f'{dataset}/{field}': self.dicts[dataset][field] for dataset, field in scores.index}, axis=1)
+        return pd.concat([scores.set_axis(data.columns).to_frame().T, data])
+
+    def get_profiles(self, fields: Union[str,List[str]]) -> Dict[str, FieldProfile]:
+        """
+        Get the profiles of fields (see FieldProfile), to estimate how many participants and visits match
+        conditions on them without reading their data. The profile of a field is computed from its loaded
+        values on first use, and kept in memory and in the on-disk cache (if enabled) until its source files change.
+
+        Args:
+            fields (Union[str,List[str]]): Fields to profile, as in load().
+
+        Returns:
+            Dict[str, FieldProfile]: The profile of each field by dataset/field, or None for fields without participants.
+        """
+        names = self.get(fields).columns.tolist()
+        dataset_fields = {}
+        for name in names:
+            dataset, field = name.split('/', 1)
+            dataset_fields.setdefault(dataset, []).append(field)
+        # loaders are not thread-safe, so datasets are profiled concurrently, and the fields of each dataset serially
+        profiles = self.__map__(
+            lambda dataset: [self.__get_profile__(dataset, field) for field in dataset_fields[dataset]],
+            list(dataset_fields))
+        profiles = {f'{dataset}/{field}': profile for dataset, dataset_profiles in zip(dataset_fields, profiles)
+                    for field, profile in zip(dataset_fields[dataset], dataset_profiles)}
+        return {name: profiles[name] for name in names}
+
+    def __get_profile__(self, dataset: str, field: str) -> Union[FieldProfile, None]:
+        """
+        Get the profile of a field from memory or from the on-disk cache, or compute it.
+
+        Args:
+            dataset (str): The name of the dataset.
+            field (str): The name of the field.
+
+        Returns:
+            FieldProfile: The profile, or None if the field has no participants.
+        """
+        loader = self.__get_loader__(dataset)
+        dictionary = self.dicts[dataset]
+        locations = [os.sep.join(loc.split(os.sep)[1:]) for loc in
+                     dictionary.loc['relative_location', dictionary.columns == field].dropna().unique()]
+        key = dict(profile=field, dataset=os.path.abspath(loader.dataset_path), cohort=self.cohort,
+                   sources=[get_file_fingerprint(os.path.join(loader.dataset_path, loc)) for loc in locations],
+                   tables=[loader.__get_cache_key__(loc) for loc in locations],
+                   bins=PROFILE_BINS, sketch_size=PROFILE_SKETCH_SIZE, kwargs=self.kwargs)
+        memory_key = json.dumps(key, sort_keys=True, default=str)
+        if memory_key in self.__profiles__:
+            return self.__profiles__[memory_key]
+
+        cache_key = None
+        if self.cache is not None and len(locations) and None not in key['sources']:
+            cache_key = self.cache.make_key(**key)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.__profiles__[memory_key] = FieldProfile(cached[0])
+                return self.__profiles__[memory_key]
+
+        values = loader.get([field])
+        profile = None
+        if field in values.columns and 'participant_id' in values.index.names:
+            profile = FieldProfile.from_values(values[field])
+            if cache_key is not None:
+                try:
+                    self.cache.put(cache_key, profile.bins)
+                except Exception as err:
+                    if self.errors in ['raise', 'warn']:
+                        warnings.warn(f'Error caching the profile of {dataset}/{field}:\n{err}')
+        self.__profiles__[memory_key] = profile
+        return profile
+
     def __repr__(self):
         """
         Return string representation of object
@@ -198,27 +505,94 @@ class MetaLoader:
             return df1
         return df1.join(df2, how='outer')
 
+    def memory_report(self, per_column: bool = True) -> pd.DataFrame:
+        """
+        Report the deep memory usage of the data dictionaries of all datasets and of the tables
+        held by warm loaders, as in PhenoLoader.memory_report().
+
+        Args:
+            per_column (bool): Whether to report each column and index level. Defaults to True (otherwise per dictionary).
+
+        Returns:
+            pd.DataFrame: The dtype and memory in bytes of each column and index level.
+        """
+        report = [PhenoLoader.__get_memory_usage__(f'{dataset} dictionary', df) for dataset, df in self.dicts.items()]
+        for dataset, loader in list(self.loaders.items()):
+            report += [PhenoLoader.__get_memory_usage__(f'{dataset}/{table_name}', df)
+                       for table_name, df in list(loader.dfs.dfs.items())]
+        return PhenoLoader.__summarize_memory_usage__(report, per_column)
+
     def __load_dictionaries__(self) -> None:
         """
         Load all dictionaries in the base_path.
         """
-        dicts = dd.read_csv(os.path.join(self.dataset_path, 'metadata', '*_dict*.csv'),
-                            include_path_column=True,
-                            dtype='object'  # Setting the default dtype for all columns as 'object
-                            ).compute()
-        
+        paths = sorted(glob(os.path.join(self.dataset_path, 'metadata', '*_dict*.csv')))
+        dicts = self.__read_dictionaries__(paths)
+
         if self.cohort is None:
             dataset_ind = -3
         else:
             dataset_ind = -4
-        dicts['dataset'] = dicts['path'].str.split('/').str[dataset_ind]
+        dicts['dataset'] = dicts['path'].map({path: path.split('/')[dataset_ind] for path in paths})
         dicts = dicts.drop(columns=['path'])
         self.fields = dicts['tabular_field_name'].unique()
 
+        self.__field_index__ = None
         self.dicts = {}
         col_order = ['dataset'] + dicts.columns.drop('dataset').tolist()
-        for dataset in dicts['dataset'].unique():
-            self.dicts[dataset] = dicts.loc[dicts['dataset'] == dataset, col_order].set_index('tabular_field_name').T
+        for dataset, df in dicts.groupby('dataset', sort=False):
+            self.dicts[dataset] = df[col_order].set_index('tabular_field_name').T
+
+    def __read_dictionaries__(self, paths: List[str]) -> pd.DataFrame:
+        """
+        Read the dictionaries from the catalog in the on-disk cache, and parse only the dictionaries
+        that were added or changed since the catalog was written. The catalog is updated if needed.
+        Without an on-disk cache (cache_path is None) all dictionaries are parsed.
+
+        Args:
+            paths (List[str]): The paths to the dictionaries.
+
+        Returns:
+            pd.DataFrame: The concatenated dictionaries, with the path of each dictionary.
+        """
+        catalog, files = {}, {}
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(catalog=os.path.abspath(self.dataset_path))
+            cached = self.cache.get(key)
+            if cached is not None:
+                df, metadata = cached
+                files = metadata.get('files', {})
+                catalog = dict(list(df.groupby('path', sort=False)))
+
+        dicts = []
+        new_files = {}
+        for path in paths:
+            fingerprint = get_file_fingerprint(path)
+            entry = files.get(path)
+            if fingerprint is not None and entry is not None and entry[0] == fingerprint and path in catalog:
+                # the catalog holds the union of all columns, so each dictionary keeps its own columns
+                df = catalog[path][entry[1]]
+            else:
+                # dictionaries are parsed once per process, and again only if they change
+                df = metadata_registry.read_csv(path, dtype='object')\
+                    .assign(path=path)  # Setting the default dtype for all columns as 'object
+            if fingerprint is not None:
+                new_files[path] = [fingerprint, df.columns.tolist()]
+            dicts.append(df)
+        dicts = pd.concat(dicts, ignore_index=True)
+        # missing values are read from Arrow as None
+        dicts = dicts.where(dicts.notnull(), np.nan)
+
+        if key is not None and new_files != files:
+            self.cache.put(key, dicts, {'files': new_files})
+        # the search index is stored with the same fingerprints, so it is rebuilt when any dictionary changes
+        self.__search_key__ = None
+        if key is not None and len(new_files) == len(paths):
+            self.__search_key__ = self.cache.make_key(
+                search_index=os.path.abspath(self.dataset_path), files=new_files, text_props=FieldSearchIndex.text_props,
+                k1=FieldSearchIndex.k1, b=FieldSearchIndex.b)
+        return dicts
 
     def __get_dataset_path__(self):
         """
@@ -1,20 +1,31 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_pheno_loader.ipynb.
 
 # %% auto 0
-__all__ = ['PhenoLoader']
+__all__ = ['LazyDataFrames', 'TableRouter', 'RowKeyDictionary', 'PhenoLoader']
 
 # %% ../nbs/05_pheno_loader.ipynb 3
 from glob import glob
 import traceback
 
+import operator
 import os
 import re
-from typing import List, Any, Dict, Union
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from collections import deque
+import contextlib
+import functools
+from typing import List, Any, Callable, Dict, Iterator, Tuple, Union
 import warnings
 import logging
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.dataset as ds
+import pyarrow.compute as pc
 
 # %% ../nbs/05_pheno_loader.ipynb 4
 from pheno_utils.config import (
@@ -25,13 +36,386 @@ from pheno_utils.config import (
     BULK_DATA_PATH,
     DICT_PROPERTY_PATH, 
     DATA_CODING_PATH,
-    PREFERRED_LANGUAGE
+    PREFERRED_LANGUAGE,
+    N_JOBS,
+    CACHE_PATH,
+    CACHE_SIZE,
+    RESULT_CACHE_SIZE,
+    RESULT_CACHE_MEMORY,
+    DTYPE_BACKEND,
+    COMPACT_DTYPES
     )
 from .basic_analysis import custom_describe
 from .bulk_data_loader import get_function_for_field_type
-from .questionnaires_handler import transform_dataframe
+from .cache import TableCache, ResultCache, get_file_fingerprint, metadata_registry
+from .field_search import FieldSearchIndex
+from .questionnaires_handler import transform_dataframe, convert_from_arrow
 
 # %% ../nbs/05_pheno_loader.ipynb 5
+class LazyDataFrames(MutableMapping):
+    """
+    Dictionary of tables that are loaded only when they are first accessed.
+    Tables registered with their list of columns can also be loaded column by column,
+    in which case columns are added to the stored table as they are requested.
+
+    Args:
+
+        loaders (dict, optional): A dictionary of functions, one for each table, that return the loaded table
+            (or None if it could not be loaded). Defaults to {}.
+    """
+
+    def __init__(self, loaders: Dict[str, Callable[..., pd.DataFrame]] = {}) -> None:
+        self.loaders = dict(loaders)
+        self.names = list(self.loaders)
+        self.dfs = {}
+        self.columns = {}
+
+    def __getitem__(self, table_name: str) -> pd.DataFrame:
+        if table_name in self.columns:
+            return self.get_columns(table_name, self.columns[table_name])
+        if table_name not in self.dfs:
+            if table_name not in self.loaders:
+                raise KeyError(table_name)
+            df = self.loaders.pop(table_name)()
+            if df is None:
+                # failed to load, the table is dropped as in the eager mode
+                self.names.remove(table_name)
+                raise KeyError(table_name)
+            self.dfs[table_name] = df
+        return self.dfs[table_name]
+
+    def __setitem__(self, table_name: str, df: pd.DataFrame) -> None:
+        if table_name not in self.names:
+            self.names.append(table_name)
+        self.loaders.pop(table_name, None)
+        self.columns.pop(table_name, None)
+        self.dfs[table_name] = df
+
+    def __delitem__(self, table_name: str) -> None:
+        if table_name not in self.names:
+            raise KeyError(table_name)
+        self.names.remove(table_name)
+        self.loaders.pop(table_name, None)
+        self.columns.pop(table_name, None)
+        self.dfs.pop(table_name, None)
+
+    def __iter__(self):
+        return iter(list(self.names))
+
+    def __contains__(self, table_name: str) -> bool:
+        # checking for a table does not load it
+        return table_name in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f'LazyDataFrames({self.names}, loaded={list(self.dfs)})'
+
+    def add_loader(self, table_name: str, loader: Callable[..., pd.DataFrame], columns: List[str] = None) -> None:
+        """
+        Register a table that will be loaded on first access.
+
+        Args:
+            table_name (str): The name of the table.
+            loader (callable): A function that returns the loaded table (or None).
+            columns (List[str], optional): All the columns of the table. If given, the table is loaded column by column,
+                and the loader is called with the list of columns to load. Defaults to None.
+        """
+        if table_name not in self.names:
+            self.names.append(table_name)
+        self.dfs.pop(table_name, None)
+        self.loaders[table_name] = loader
+        if columns is not None:
+            self.columns[table_name] = list(columns)
+        else:
+            self.columns.pop(table_name, None)
+
+    def get_columns(self, table_name: str, columns: List[str]) -> pd.DataFrame:
+        """
+        Get a table containing at least the requested columns that exist in it.
+        Only columns that were not loaded yet are read. Tables that cannot be loaded
+        column by column are loaded in full.
+
+        Args:
+            table_name (str): The name of the table.
+            columns (List[str]): The requested columns.
+
+        Returns:
+            pd.DataFrame: The table with all the columns loaded so far.
+        """
+        if table_name not in self.columns:
+            return self[table_name]
+
+        df = self.dfs.get(table_name)
+        loaded = set() if df is None else set(df.columns)
+        requested = set(columns)
+        missing = [col for col in self.columns[table_name] if col in requested and col not in loaded]
+        if df is None or len(missing):
+            new_df = self.loaders[table_name](missing)
+            if new_df is None:
+                del self[table_name]
+                raise KeyError(table_name)
+            if df is not None:
+                new_df = pd.concat([df, new_df.set_axis(df.index, axis=0)], axis=1)
+                # keep the same index object, so that results cached by index identity remain valid
+                new_df.index = df.index
+            self.dfs[table_name] = df = new_df
+
+        if set(self.columns[table_name]).issubset(df.columns):
+            # all columns were loaded
+            self.loaders.pop(table_name, None)
+            self.columns.pop(table_name, None)
+        return df
+
+    def is_loaded(self, table_name: str) -> bool:
+        """
+        Check whether a table has already been loaded.
+        """
+        return table_name in self.dfs
+
+    def load_all(self) -> None:
+        """
+        Load all tables that were not loaded yet.
+        """
+        for table_name in self.names.copy():
+            self.get(table_name)
+
+# %% ../nbs/05_pheno_loader.ipynb 6
+class TableRouter:
+    """
+    Index of the tables that contain each field, either as a column or as an index level,
+    and of the parent dataframe of each bulk field. It is built once when tables are registered
+    and updated only when a table changes, so that finding the tables of a field does not
+    depend on the number of tables.
+
+    Attributes:
+
+        columns (dict): The tables containing each field as a column.
+        index_levels (dict): The tables containing each field as an index level.
+        table_columns (dict): The columns of each table.
+        table_levels (dict): The index levels of each table.
+        parents (dict): The parent dataframes of each bulk field.
+    """
+
+    def __init__(self) -> None:
+        self.columns = {}
+        self.index_levels = {}
+        self.table_columns = {}
+        self.table_levels = {}
+        self.parents = {}
+        self.refs = {}
+
+    def __repr__(self) -> str:
+        return f'TableRouter for {len(self.columns)} fields in {len(self.table_columns)} tables'
+
+    def add_table(self, table_name: str, columns: List[str] = [], index_levels: List[str] = []) -> None:
+        """
+        Add the columns and index levels of a table to the index.
+
+        Args:
+            table_name (str): The name of the table.
+            columns (List[str], optional): Columns of the table. Defaults to [].
+            index_levels (List[str], optional): Index levels of the table. Defaults to [].
+        """
+        self.table_columns.setdefault(table_name, set()).update(columns)
+        self.table_levels.setdefault(table_name, set()).update([l for l in index_levels if l is not None])
+        for col in columns:
+            self.columns.setdefault(col, set()).add(table_name)
+        for level in self.table_levels[table_name]:
+            self.index_levels.setdefault(level, set()).add(table_name)
+
+    def remove_table(self, table_name: str) -> None:
+        """
+        Remove a table from the index.
+        """
+        for col in self.table_columns.pop(table_name, set()):
+            self.columns[col].discard(table_name)
+            if len(self.columns[col]) == 0:
+                del self.columns[col]
+        for level in self.table_levels.pop(table_name, set()):
+            self.index_levels[level].discard(table_name)
+            if len(self.index_levels[level]) == 0:
+                del self.index_levels[level]
+        self.refs.pop(table_name, None)
+
+    def sync(self, dfs: LazyDataFrames) -> None:
+        """
+        Update the index for loaded tables that were added, removed or modified since the last sync.
+        Tables that are only partially loaded keep their registered columns.
+
+        Args:
+            dfs (LazyDataFrames): The tables.
+        """
+        for table_name in list(self.table_columns):
+            if table_name not in dfs:
+                self.remove_table(table_name)
+        for table_name, df in dfs.dfs.items():
+            ref = self.refs.get(table_name)
+            if ref is not None and ref[0] is df.columns and ref[1] is df.index:
+                continue
+            if table_name not in dfs.columns:
+                self.remove_table(table_name)
+            self.add_table(table_name, df.columns, df.index.names)
+            self.refs[table_name] = (df.columns, df.index)
+
+    def set_parents(self, dict_df: pd.DataFrame) -> None:
+        """
+        Index the parent dataframes of bulk fields.
+
+        Args:
+            dict_df (pd.DataFrame): The data dictionary.
+        """
+        self.parents = {}
+        if 'parent_dataframe' not in dict_df.columns:
+            return
+        for field, parent in dict_df['parent_dataframe'].dropna().items():
+            self.parents.setdefault(field, []).append(parent)
+
+    def get_tables(self, fields: List[str]) -> set:
+        """
+        Get the tables that contain any of the fields as a column or an index level.
+        """
+        tables = set()
+        for field in fields:
+            tables.update(self.columns.get(field, ()))
+            tables.update(self.index_levels.get(field, ()))
+        return tables
+
+    def get_duplicated_columns(self, fields: List[str], table_names: List[str] = None) -> Dict[str, List[str]]:
+        """
+        Get the requested fields that are columns of more than one table, for each table.
+
+        Args:
+            fields (List[str]): The requested fields.
+            table_names (List[str], optional): Consider only these tables. Defaults to None (all tables).
+
+        Returns:
+            dict: The duplicated fields of each table.
+        """
+        duplicated = {}
+        for field in dict.fromkeys(fields):
+            tables = self.columns.get(field, set())
+            if table_names is not None:
+                tables = tables.intersection(table_names)
+            if len(tables) < 2:
+                continue
+            for table_name in tables:
+                duplicated.setdefault(table_name, []).append(field)
+        return duplicated
+
+# %% ../nbs/05_pheno_loader.ipynb 7
+class RowKeyDictionary:
+    """
+    Dictionary of the distinct index tuples of all tables in a dataset, where each tuple is
+    encoded as a dense integer row key. Row keys of different tables can be joined, compared
+    and filtered as integer arrays, and decoded back to an index.
+
+    Attributes:
+
+        index (pd.Index): The distinct index tuples, where the row key of each tuple is its position.
+        undefined (np.ndarray): Whether the research stage of each row key is 'undefined'.
+    """
+
+    def __init__(self) -> None:
+        self.index = None
+        self.undefined = np.zeros(0, dtype=bool)
+        self.__rank__ = None
+
+    def __len__(self) -> int:
+        return 0 if self.index is None else len(self.index)
+
+    def __repr__(self) -> str:
+        names = [] if self.index is None else list(self.index.names)
+        return f'RowKeyDictionary with {len(self)} row keys of {names}'
+
+    @staticmethod
+    def __get_level_dtypes__(index: pd.Index) -> list:
+        if isinstance(index, pd.MultiIndex):
+            return [level.dtype for level in index.levels]
+        return [index.dtype]
+
+    @staticmethod
+    def __has_missing__(index: pd.Index) -> bool:
+        if isinstance(index, pd.MultiIndex):
+            return any([(codes == -1).any() for codes in index.codes])
+        return index.hasnans
+
+    def is_compatible(self, index: pd.Index) -> bool:
+        """
+        Check whether an index can be encoded, i.e., it has no missing values, and the same
+        levels and level dtypes as the indices that were already encoded.
+        """
+        if self.__has_missing__(index):
+            return False
+        if self.index is None:
+            return True
+        return list(index.names) == list(self.index.names) and \
+            self.__get_level_dtypes__(index) == self.__get_level_dtypes__(self.index)
+
+    def encode(self, index: pd.Index) -> Union[np.ndarray, None]:
+        """
+        Encode an index as row keys, adding new index tuples to the dictionary.
+
+        Args:
+            index (pd.Index): The index to encode.
+
+        Returns:
+            np.ndarray: The row key of each index tuple, or None if the index is not compatible
+        """
+        if not self.is_compatible(index):
+            return None
+        if self.index is None:
+            keys = np.full(len(index), -1, dtype=np.int64)
+        else:
+            keys = self.index.get_indexer(index).astype(np.int64)
+        new = keys < 0
+        if new.any():
+            new_index = index[new].unique()
+            n_keys = len(self)
+            self.index = new_index if self.index is None else self.index.append(new_index)
+            keys[new] = n_keys + new_index.get_indexer(index[new])
+            undefined = np.zeros(len(new_index), dtype=bool)
+            if 'research_stage' in new_index.names:
+                undefined = np.asarray(new_index.get_level_values('research_stage') == 'undefined')
+            self.undefined = np.concatenate([self.undefined, undefined])
+            self.__rank__ = None
+        return keys
+
+    def decode(self, keys: np.ndarray) -> pd.Index:
+        """
+        Decode row keys to an index.
+        """
+        return self.index.take(keys)
+
+    def sort(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Sort row keys in the order of their sorted index tuples.
+        """
+        if self.__rank__ is None:
+            self.__rank__ = np.empty(len(self), dtype=np.int64)
+            self.__rank__[self.index.argsort()] = np.arange(len(self))
+        return keys[np.argsort(self.__rank__[keys], kind='stable')]
+
+    def get_lookup(self, keys: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Get an array mapping each row key to its position in keys (or -1 if it is missing).
+
+        Args:
+            keys (np.ndarray): Unique row keys.
+            mask (np.ndarray, optional): Include only these positions of keys. Defaults to None (all).
+
+        Returns:
+            np.ndarray: The position of each row key.
+        """
+        lookup = np.full(len(self), -1, dtype=np.int64)
+        positions = np.arange(len(keys))
+        if mask is not None:
+            keys, positions = keys[mask], positions[mask]
+        lookup[keys] = positions
+        return lookup
+
+# %% ../nbs/05_pheno_loader.ipynb 8
 class PhenoLoader:
     """
     Class to load multiple tables from a dataset and allows to easily access
@@ -52,11 +436,32 @@ class PhenoLoader:
         join_non_overlapping (bool, optional): Whether to join tables with non-overlapping indices. Defaults to False.
         errors (str, optional): Whether to raise an error or issue a warning if missing data is encountered.
             Possible values are 'raise', 'warn' and 'ignore'. Defaults to ERROR_ACTION.
+        lazy (bool, optional): Whether to load each table only when one of its fields is first requested.
+            Tables are matched to fields using the data dictionary. Defaults to False.
+        project_columns (bool, optional): Whether to read from each table only the requested columns (and the index).
+            Columns are added to the loaded tables as they are requested. Implies lazy loading. Defaults to False.
+        n_jobs (int, optional): The number of threads used to read and translate tables concurrently.
+            Use -1 for all CPUs. Defaults to N_JOBS.
+        cache_path (str, optional): A directory for caching translated and filtered tables on disk.
+            Defaults to CACHE_PATH (None disables the cache).
+        cache_size (int, optional): The maximum size of the cache in bytes. Defaults to CACHE_SIZE.
+        result_cache_size (int, optional): The maximum number of results of get() that are cached in memory.
+            The tables are assumed not to change, unless clear_cache() is called. Defaults to RESULT_CACHE_SIZE (0 disables the cache).
+        result_cache_memory (int, optional): The maximum total memory of cached results in bytes. Defaults to RESULT_CACHE_MEMORY.
+        dtype_backend (str, optional): The backend of the dtypes of loaded columns, as in pd.read_parquet. Use 'pyarrow'
+            to keep columns Arrow-backed, which uses much less memory for strings. Index levels keep NumPy dtypes.
+            Defaults to DTYPE_BACKEND (None uses NumPy dtypes).
+        compact_dtypes (str or dict, optional): How to compact the dtypes of loaded tables. 'lossless' downcasts integer
+            columns to the smallest type that holds their values, and float columns to float32 when no value changes.
+            'float32' downcasts all float columns to float32. Both also share equal index levels between tables.
+            A dict maps dataset names (or 'default') to a policy. Defaults to COMPACT_DTYPES (None disables compaction).
 
     Attributes:
     
         dict (pd.DataFrame): The data dictionary for the dataset, containing information about each field.
-        dfs (dict): A dictionary of dataframes, one for each table in the dataset.
+        field_index (FieldSearchIndex): A search index of the fields in the data dictionary, used for flexible field search.
+        dfs (LazyDataFrames): A dictionary of dataframes, one for each table in the dataset.
+        router (TableRouter): An index of the tables that contain each field, used to search only the relevant tables.
         fields (list): A list of all fields in the dataset.
         dataset (str): The name of the dataset being used.
         cohort (str): The name of the cohort being used.
@@ -72,6 +477,14 @@ class PhenoLoader:
         join_non_overlapping (bool): Whether to join tables with non-overlapping indices.
         errors (str): Whether to raise an error or issue a warning if missing data is encountered.
         preferred_language (str): The preferred language for the questionnaires.
+        lazy (bool): Whether tables are loaded only when one of their fields is first requested.
+        project_columns (bool): Whether only the requested columns are read from each table.
+        n_jobs (int): The number of threads used to read and translate tables concurrently.
+        cache (TableCache): The on-disk cache of tables, or None if disabled.
+        result_cache (ResultCache): The in-memory cache of results of get(), or None if disabled.
+        row_keys (RowKeyDictionary): The integer row keys of the index tuples of all tables, used to join tables.
+        dtype_backend (str): The backend of the dtypes of loaded columns.
+        compact_dtypes (str): How the dtypes of loaded tables are compacted, or None.
     """
 
     def __init__(
@@ -90,7 +503,16 @@ class PhenoLoader:
         read_parquet_kwargs: Dict[str, Any] = {},
         preferred_language: str = PREFERRED_LANGUAGE,
         keep_undefined_research_stage: bool = False, 
-        join_non_overlapping: bool = False
+        join_non_overlapping: bool = False,
+        lazy: bool = False,
+        project_columns: bool = False,
+        n_jobs: int = N_JOBS,
+        cache_path: str = CACHE_PATH,
+        cache_size: int = CACHE_SIZE,
+        result_cache_size: int = RESULT_CACHE_SIZE,
+        result_cache_memory: int = RESULT_CACHE_MEMORY,
+        dtype_backend: str = DTYPE_BACKEND,
+        compact_dtypes: Union[str, Dict[str, str]] = COMPACT_DTYPES
     ) -> None:
         self.dataset = dataset
         self.cohort = cohort
@@ -109,12 +531,41 @@ class PhenoLoader:
         self.errors = errors
         self.read_parquet_kwargs = read_parquet_kwargs
         self.preferred_language = preferred_language
-        self.data_codings = pd.read_csv(DATA_CODING_PATH) # TODO: convert to csv when it will be available
+        self.project_columns = project_columns
+        self.lazy = lazy or project_columns
+        self.n_jobs = n_jobs
+        if dtype_backend not in [None, 'numpy_nullable', 'pyarrow']:
+            raise ValueError(f"dtype_backend must be None, 'numpy_nullable' or 'pyarrow', got {dtype_backend}")
+        self.dtype_backend = dtype_backend
+        if isinstance(compact_dtypes, dict):
+            compact_dtypes = compact_dtypes.get(dataset, compact_dtypes.get('default'))
+        if compact_dtypes is True:
+            compact_dtypes = 'lossless'
+        if compact_dtypes not in [None, False, 'lossless', 'float32']:
+            raise ValueError(f"compact_dtypes must be None, 'lossless' or 'float32', got {compact_dtypes}")
+        self.compact_dtypes = compact_dtypes or None
+        self.__compaction__ = {}
+        self.__index_levels__ = {}
+        self.__dict_lock__ = threading.Lock()
+        self.row_keys = RowKeyDictionary()
+        self.__row_keys__ = {}
+        self.__overlap_cache__ = {}
+        self.cache = None
+        if cache_path is not None:
+            self.cache = TableCache(cache_path, cache_size)
+        self.result_cache = None
+        if result_cache_size:
+            self.result_cache = ResultCache(result_cache_size, result_cache_memory)
+        self.coding_mapping = metadata_registry.read_csv(DATA_CODING_PATH) # TODO: convert to csv when it will be available
+        self.data_codings = self.coding_mapping
         self.__load_dictionary__()
         self.__load_dataframes__()
         if self.age_sex_dataset is not None:
             self.__load_age_sex__()
-        self.dict_prop = pd.read_csv(DICT_PROPERTY_PATH, index_col='field_type')
+        # the row keys of loaded tables are encoded once
+        for table_name in list(self.dfs.dfs):
+            self.__get_row_keys__(table_name)
+        self.dict_prop = metadata_registry.read_csv(DICT_PROPERTY_PATH, index_col='field_type')
         self.keep_undefined_research_stage = keep_undefined_research_stage
         self.join_non_overlapping = join_non_overlapping
 
@@ -159,13 +610,16 @@ class PhenoLoader:
         array_index: Union[None, int, List[int]] = None,
         parent_bulk: Union[None, str] = None,
         load_func: callable = None,
-        concat: bool = True,
+        concat: Union[bool, str] = True,
         pivot=None,
         keep_undefined_research_stage: Union[None, str] = None,
         join_non_overlapping: Union[None, bool] = None,
         extend_bulk_index: bool = True,
+        dtype_backend: Union[None, str] = None,
+        n_jobs: Union[None, int] = None,
+        executor: Union[str, Executor] = 'thread',
         **kwargs
-    ) -> Union[pd.DataFrame, None]:
+    ) -> Union[pd.DataFrame, List[Any], Iterator[Any], None]:
         """
         Load time series or bulk data for sample(s).
 
@@ -176,12 +630,132 @@ class PhenoLoader:
             research_stage (str or list, optional): The research stage or stages to load data for.
             array_index (int or list, optional): The array index or indices to load data for.
             load_func (callable, optional): [Deprecated] The function to use to load the data. Defaults to pd.read_parquet
-            concat (bool, optional): Whether to concatenate the data into a single DataFrame. Automatically ignored if data is not a DataFrame. Defaults to True.
+            concat (bool or str, optional): Whether to concatenate the data into a single DataFrame. Automatically ignored if data is not a DataFrame.
+                Use 'stream' to return an iterator over the data of each file instead, as in iter_bulk_data(). Defaults to True.
             pivot (str, optional): The name of the field to pivot the data on (if DataFrame). Defaults to None.
             keep_undefined_research_stage (bool, optional): Whether to keep samples with undefined research stage. Defaults to None.
             join_non_overlapping (bool, optional): Whether to join tables with non-overlapping indices. Defaults to None.
             extend_bulk_index (bool, optional): Whether to extend the bulk index to match the main table index. Defaults to False.
+            dtype_backend (str, optional): The backend of the dtypes of bulk parquet files, as in pd.read_parquet.
+                Defaults to None, which uses the PhenoLoader's dtype_backend attribute.
+            n_jobs (int, optional): The number of files loaded concurrently. Use -1 for all CPUs.
+                Defaults to None, which uses the PhenoLoader's n_jobs attribute.
+            executor (str or Executor, optional): 'thread' to load files in a thread pool (for I/O-bound loading), 'process'
+                for a process pool (for CPU-bound parsing, where load_func and kwargs must be picklable), or an Executor
+                to use (which is not shut down). Files are returned in the same order in all cases. Defaults to 'thread'.
+                Parquet files are instead read in a single multi-threaded pyarrow dataset scan (without threads if n_jobs=1),
+                where the sliced columns and rows of the fields and the requested samples are pushed down to the scan.
+        """
+        if concat == 'stream':
+            return self.iter_bulk_data(
+                field_name,
+                participant_id=participant_id,
+                research_stage=research_stage,
+                array_index=array_index,
+                parent_bulk=parent_bulk,
+                load_func=load_func,
+                pivot=pivot,
+                keep_undefined_research_stage=keep_undefined_research_stage,
+                join_non_overlapping=join_non_overlapping,
+                extend_bulk_index=extend_bulk_index,
+                dtype_backend=dtype_backend,
+                n_jobs=n_jobs,
+                executor=executor,
+                **kwargs
+            )
+        bulk = self.__get_bulk_files__(
+            field_name, participant_id, research_stage, array_index, parent_bulk, load_func,
+            keep_undefined_research_stage, join_non_overlapping, dtype_backend, kwargs)
+        if bulk is None:
+            return None
+        data = list(self.__iter_bulk__(*bulk, extend_bulk_index, dtype_backend, n_jobs, executor))
+
+        # format the final result
+        if concat and isinstance(data[0], pd.DataFrame):
+            data = pd.concat(data, axis=0)
+        if pivot is not None and isinstance(data, pd.DataFrame):
+            data = self.__pivot_bulk__(data, pivot)
+
+        return data
+
+    def iter_bulk_data(
+        self,
+        field_name: Union[str, List[str]],
+        participant_id: Union[None, int, List[int]] = None,
+        research_stage: Union[None, str, List[str]] = None,
+        array_index: Union[None, int, List[int]] = None,
+        parent_bulk: Union[None, str] = None,
+        load_func: callable = None,
+        pivot=None,
+        keep_undefined_research_stage: Union[None, str] = None,
+        join_non_overlapping: Union[None, bool] = None,
+        extend_bulk_index: bool = True,
+        dtype_backend: Union[None, str] = None,
+        n_jobs: Union[None, int] = None,
+        executor: Union[str, Executor] = 'thread',
+        **kwargs
+    ) -> Iterator[Any]:
+        """
+        Iterate over time series or bulk data for sample(s), one bulk file (typically a participant and research stage) at a time.
+        Unlike load_bulk_data(), the data is not accumulated, and at most 2 * n_jobs files are loaded ahead of the one
+        being consumed, so the memory used does not grow with the number of samples. Parquet files are scanned together
+        in consecutive windows of 2 * n_jobs files for this purpose.
+        Samples are selected and validated when this method is called, and files are loaded as the iterator is consumed.
+
+        Args:
+            field_name (str or List): The name of the field(s) to load.
+            participant_id (str or list, optional): The participant ID or IDs to load data for.
+            research_stage (str or list, optional): The research stage or stages to load data for.
+            array_index (int or list, optional): The array index or indices to load data for.
+            parent_bulk (str, optional): The name of the field that points to the bulk data file. Defaults to None (inferred from field_name).
+            load_func (callable, optional): [Deprecated] The function to use to load the data. Defaults to pd.read_parquet
+            pivot (str, optional): The name of the field to pivot the data of each file on (if DataFrame). Defaults to None.
+            keep_undefined_research_stage (bool, optional): Whether to keep samples with undefined research stage. Defaults to None.
+            join_non_overlapping (bool, optional): Whether to join tables with non-overlapping indices. Defaults to None.
+            extend_bulk_index (bool, optional): Whether to extend the bulk index to match the main table index. Defaults to True.
+            dtype_backend (str, optional): The backend of the dtypes of bulk parquet files, as in pd.read_parquet.
+                Defaults to None, which uses the PhenoLoader's dtype_backend attribute.
+            n_jobs (int, optional): The number of files loaded concurrently. Use -1 for all CPUs.
+                Defaults to None, which uses the PhenoLoader's n_jobs attribute.
+            executor (str or Executor, optional): 'thread', 'process' or an Executor, as in load_bulk_data(). Defaults to 'thread'.
+
+        Returns:
+            Iterator[Any]: The data of each bulk file (a DataFrame for tabular files), in the order of the samples.
+                Files that fail to load are skipped (if errors is not 'raise').
+        """
+        bulk = self.__get_bulk_files__(
+            field_name, participant_id, research_stage, array_index, parent_bulk, load_func,
+            keep_undefined_research_stage, join_non_overlapping, dtype_backend, kwargs)
+        if bulk is None:
+            return iter(())
+        data = self.__iter_bulk__(*bulk, extend_bulk_index, dtype_backend, n_jobs, executor, stream=True)
+        if pivot is not None:
+            data = (self.__pivot_bulk__(d, pivot) if isinstance(d, pd.DataFrame) else d for d in data)
+        return data
+
+    def __get_bulk_files__(
+        self,
+        field_name: Union[str, List[str]],
+        participant_id: Union[None, int, List[int]],
+        research_stage: Union[None, str, List[str]],
+        array_index: Union[None, int, List[int]],
+        parent_bulk: Union[None, str],
+        load_func: Union[None, Callable],
+        keep_undefined_research_stage: Union[None, str],
+        join_non_overlapping: Union[None, bool],
+        dtype_backend: Union[None, str],
+        kwargs: dict
+    ) -> Union[None, Tuple[pd.DataFrame, str, Tuple[str, dict], List[str], Callable, dict]]:
         """
+        Get the samples and bulk files to load for bulk fields.
+
+        Returns:
+            Tuple[pd.DataFrame, str, Tuple[str, dict], List[str], Callable, dict]: The samples, the column of bulk paths,
+                the query that filters the samples (and its local variables), the bulk fields,
+                the load function and its keyword arguments. None if no samples were found.
+        """
+        if dtype_backend is None:
+            dtype_backend = self.dtype_backend
         if keep_undefined_research_stage is None:
             keep_undefined_research_stage = self.keep_undefined_research_stage
         if join_non_overlapping is None:
@@ -265,43 +839,269 @@ class PhenoLoader:
             else:
                 field_type = self.dict.loc[fields, 'field_type'].values[0]
             load_func = get_function_for_field_type(field_type)
-        sample_path = sample.loc[:, col]
-        sample_path = self.__slice_bulk_partition__(fields, sample_path)
         kwargs.update(self.__slice_bulk_data__(fields))
-        data = []
-        for p in sample_path.unique():
-            try:
-                data.append(load_func(p, **kwargs))
-                if isinstance(data[-1], pd.DataFrame):
-                    if extend_bulk_index:
-                        data[-1] = self.__add_missing_levels__(
-                            data[-1],
-                            sample.loc[sample[col] == p, :].drop(
-                                columns=['participant_id'],
-                                errors='ignore'
+        if load_func is pd.read_parquet and dtype_backend is not None:
+            kwargs.setdefault('dtype_backend', dtype_backend)
+
+        query = (query_str, {'participant_id': participant_id, 'research_stage': research_stage, 'array_index': array_index})
+
+        return sample, col, query, fields, load_func, kwargs
+
+    def __iter_bulk__(
+        self,
+        sample: pd.DataFrame,
+        col: str,
+        query: Tuple[str, dict],
+        fields: List[str],
+        load_func: Callable,
+        kwargs: dict,
+        extend_bulk_index: bool,
+        dtype_backend: Union[None, str],
+        n_jobs: Union[None, int],
+        executor: Union[str, Executor],
+        stream: bool = False
+    ) -> Iterator[Any]:
+        """
+        Load bulk files and yield their data one by one, in the order of the samples.
+        When streaming, at most 2 * n_jobs files are loaded ahead of the one that is yielded.
+        """
+        if dtype_backend is None:
+            dtype_backend = self.dtype_backend
+        if n_jobs is None:
+            n_jobs = self.n_jobs
+        # the query refers to the samples filters as local variables
+        query_str, query_vars = query
+        participant_id, research_stage, array_index = \
+            query_vars['participant_id'], query_vars['research_stage'], query_vars['array_index']
+        paths = sample[col].unique()
+        # parquet files are read in a single scan (or in windows of files when streaming), and other files are loaded concurrently
+        scan = self.__plan_bulk_scan__(paths, fields, load_func, kwargs, query_vars, n_jobs)
+        if scan is None:
+            files = self.__slice_bulk_partition__(fields, pd.Series(paths)).values
+            loaded = self.__map_bulk__(load_func, files, kwargs, n_jobs, executor)
+        else:
+            files = paths
+            window = 2 * max(os.cpu_count() if n_jobs in [None, -1] else n_jobs, 1) if stream else len(paths)
+            # after a failed read, the remaining files are loaded one by one, so that only failing files are skipped
+            loaded = self.__scan_bulk__(*scan, kwargs.get('dtype_backend'), window, lambda start: self.__map_bulk__(
+                load_func, self.__slice_bulk_partition__(fields, pd.Series(paths[start:])).values, kwargs, n_jobs, executor))
+        # files are processed one by one in their order
+        with contextlib.closing(loaded) as loaded:
+            for path, p, (result, error) in zip(paths, files, loaded):
+                try:
+                    if error is not None:
+                        raise error
+                    if isinstance(result, pd.DataFrame):
+                        if dtype_backend is not None:
+                            result.index = self.__get_numpy_index__(result.index)
+                        if extend_bulk_index:
+                            result = self.__add_missing_levels__(
+                                result,
+                                sample.loc[sample[col] == path, :].drop(
+                                    columns=['participant_id'],
+                                    errors='ignore'
+                                )
                             )
-                        )
-                    if query_str:
-                        data[-1] = data[-1].query(query_str)
-                    data[-1].sort_index(inplace=True)
+                        if query_str:
+                            result = result.query(query_str)
+                        result.sort_index(inplace=True)
+                except Exception as e:
+                    if self.errors == 'raise':
+                        raise e
+                    elif self.errors == 'warn':
+                        warnings.warn(f'Error loading {p}: {e}')
+                    if error is not None:
+                        continue
+                # files that failed to process are kept as processed so far
+                yield result
+
+    def __plan_bulk_scan__(
+        self,
+        paths: List[str],
+        fields: List[str],
+        load_func: Callable,
+        kwargs: dict,
+        query_vars: dict,
+        n_jobs: Union[None, int]
+    ) -> Union[None, Tuple[List[Union[ds.Dataset, Exception]], dict]]:
+        """
+        Plan a scan of the parquet files of bulk fields, as a union of a pyarrow dataset per path,
+        with hive partitions discovered under each path. The columns and rows sliced for the fields,
+        and the participants, research stages and array indices of the samples are pushed down to the scan.
+
+        Args:
+            paths (List[str]): The paths of the bulk files (or directories).
+            fields (List[str]): The bulk fields.
+            load_func (callable): The function that loads a file.
+            kwargs (dict): Keyword arguments of load_func.
+            query_vars (dict): The values of the samples filters (or None).
+            n_jobs (int): The number of files loaded concurrently, where 1 scans without threads.
+
+        Returns:
+            Tuple[List[Union[ds.Dataset, Exception]], dict]: The dataset of each path (or the exception raised when opening it),
+                and the keyword arguments of its scanner. None if the files should be loaded one by one with load_func,
+                with a warning if their layout cannot be scanned together.
+        """
+        if load_func is not pd.read_parquet or kwargs.get('dtype_backend') not in [None, 'pyarrow'] or \
+                kwargs.get('engine', 'pyarrow') != 'pyarrow' or \
+                not set(kwargs).issubset({'columns', 'filters', 'engine', 'dtype_backend'}):
+            return None
+        partition = self.__get_bulk_partition__(fields)
+        if isinstance(fields, str):
+            fields = [fields]
+
+        def open_dataset(path):
+            try:
+                # partition keys are discovered as dictionaries (categories), as in pd.read_parquet
+                partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+                return ds.dataset(path, format='parquet', partitioning=partitioning)
             except Exception as e:
-                if self.errors == 'raise':
-                    raise e
-                elif self.errors == 'warn':
-                    warnings.warn(f'Error loading {p}: {e}')
+                return e
 
-        # format the final result
-        if concat and isinstance(data[0], pd.DataFrame):
-            data = pd.concat(data, axis=0)
-        if pivot is not None and isinstance(data, pd.DataFrame):
-            values = data.columns
-            if len(values) == 1:
-                values = values[0]
-            if pivot in data.index.names:
-                data = data.reset_index(pivot)
-            data = data.pivot(columns=pivot, values=values)
+        # each path is listed and its schema is read, so the datasets are opened concurrently
+        workers = os.cpu_count() if n_jobs in [None, -1] else n_jobs
+        if workers <= 1:
+            children = [open_dataset(p) for p in paths]
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                children = list(pool.map(open_dataset, paths))
+        datasets = [child for child in children if isinstance(child, ds.Dataset)]
+        if not datasets:
+            return None
+        # files are scanned together only if they have the same columns, and are read once
+        schema = datasets[0].schema.remove_metadata()
+        if any(not d.schema.remove_metadata().equals(schema) for d in datasets[1:]):
+            warnings.warn(f'Bulk files of {fields} have different columns, and are loaded one by one')
+            return None
+        files = [f for d in datasets for f in d.files]
+        if len(set(files)) < len(files):
+            warnings.warn(f'Bulk paths of {fields} share files, and are loaded one by one')
+            return None
+        if partition is not None and partition not in schema.names:
+            warnings.warn(f'Bulk files of {fields} are not partitioned by {partition}, and are loaded one by one')
+            return None
 
-        return data
+        # index columns are read along with the requested columns, as in pd.read_parquet
+        columns = kwargs.get('columns')
+        columns = schema.names if columns is None else list(columns)
+        index_columns = [c for d in datasets for c in (d.schema.pandas_metadata or {}).get('index_columns', [])
+                         if isinstance(c, str)]
+        columns += [c for c in schema.names if c in index_columns and c not in columns]
+        expressions = []
+        if kwargs.get('filters'):
+            expressions.append(self.__get_bulk_expression__(kwargs['filters']))
+        if partition is not None:
+            expressions.append(pc.field(partition).isin(fields))
+            if len(fields) == 1:
+                columns = [c for c in columns if c != partition]
+        for name, values in query_vars.items():
+            if values is None or name not in schema.names:
+                continue
+            try:
+                expressions.append(pc.field(name).isin(pa.array(values).cast(schema.field(name).type)))
+            except Exception:
+                continue  # filtered after loading
+        scan_kwargs = dict(
+            columns=columns,
+            filter=functools.reduce(operator.and_, expressions) if expressions else None,
+            use_threads=n_jobs != 1
+        )
+        return children, scan_kwargs
+
+    @staticmethod
+    def __scan_bulk__(children: List[Union[ds.Dataset, Exception]], scan_kwargs: dict, dtype_backend: Union[None, str],
+                      window: int, fallback: Callable) -> Iterator[Tuple[Any, Union[Exception, None]]]:
+        """
+        Scan parquet bulk files, and yield the data of each path as it is read. The paths are scanned in
+        consecutive windows, and a window is scanned only once the data of the previous window was yielded.
+        If the scan fails, the paths that were not yielded yet are loaded by the fallback instead.
+
+        Args:
+            children (List[Union[ds.Dataset, Exception]]): The dataset of each path (or the exception raised when opening it).
+            scan_kwargs (dict): Keyword arguments of the scanner.
+            dtype_backend (str): The backend of the dtypes, as in pd.read_parquet.
+            window (int): The number of paths scanned together.
+            fallback (callable): Loads the paths from a given position one by one, as in __map_bulk__().
+
+        Returns:
+            Iterator[Tuple[Any, Union[Exception, None]]]: The data and the exception raised when reading it (or None)
+                of each path, in order.
+        """
+        types_mapper = pd.ArrowDtype if dtype_backend == 'pyarrow' else None
+        for start in range(0, len(children), max(window, 1)):
+            part = children[start:start + window]
+            datasets = [child for child in part if isinstance(child, ds.Dataset)]
+            scanner = ds.dataset(datasets).scanner(**scan_kwargs) if datasets else None
+            owners = {f: i for i, child in enumerate(part) if isinstance(child, ds.Dataset) for f in child.files}
+            batches = [[] for _ in part]
+
+            def to_pandas(i):
+                if isinstance(part[i], Exception):
+                    return None, part[i]
+                try:
+                    # each path is converted with its own pandas metadata, as when it is read alone
+                    table = pa.Table.from_batches(batches[i], schema=scanner.projected_schema) \
+                        .replace_schema_metadata(part[i].schema.metadata)
+                    batches[i] = None
+                    return table.to_pandas(types_mapper=types_mapper), None
+                except Exception as e:
+                    return None, e
+
+            done = 0
+            try:
+                for tagged in scanner.scan_batches() if scanner is not None else []:
+                    i = owners[tagged.fragment.path]
+                    while done < i:
+                        yield to_pandas(done)
+                        done += 1
+                    batches[i].append(tagged.record_batch)
+            except Exception:
+                # the failing file is not known, so it is reported by loading it again
+                yield from fallback(start + done)
+                return
+            while done < len(part):
+                yield to_pandas(done)
+                done += 1
+
+    @staticmethod
+    def __get_bulk_expression__(filters: List[Union[tuple, List[tuple]]]) -> pc.Expression:
+        """
+        Convert filters of pd.read_parquet to a pyarrow expression, where OR-clauses that compare
+        the same column to a value (or list of values) are collapsed into one isin expression.
+
+        Args:
+            filters (List[Union[tuple, List[tuple]]]): The filters, as a list of (field, op, value) tuples,
+                or a list of such lists that are combined with OR.
+
+        Returns:
+            pc.Expression: The filter expression.
+        """
+        if isinstance(filters[0], tuple):
+            filters = [filters]
+        values = {}
+        clauses = []
+        for clause in filters:
+            if len(clause) == 1 and clause[0][1] in ['==', '=', 'in']:
+                name, op, value = clause[0]
+                values.setdefault(name, []).extend(list(value) if op == 'in' else [value])
+            else:
+                clauses.append(clause)
+        expressions = [pc.field(name).isin(v) for name, v in values.items()]
+        if clauses:
+            expressions.append(pq.filters_to_expression(clauses))
+        return functools.reduce(operator.or_, expressions)
+
+    @staticmethod
+    def __pivot_bulk__(data: pd.DataFrame, pivot: str) -> pd.DataFrame:
+        """
+        Pivot bulk data on a field.
+        """
+        values = data.columns
+        if len(values) == 1:
+            values = values[0]
+        if pivot in data.index.names:
+            data = data.reset_index(pivot)
+        return data.pivot(columns=pivot, values=values)
 
     def __repr__(self):
         """
@@ -362,14 +1162,112 @@ class PhenoLoader:
         min_cutoff = 0.01
         
         return df2_defined.index.isin(df1_defined.index).sum() > min(df1_defined.shape[0], df2_defined.shape[0]) * min_cutoff
+
+    def overlap_matrix(self) -> pd.DataFrame:
+        """
+        Check whether the indices of each pair of loaded tables overlap, as done when joining tables in get().
+        Results are cached until one of the tables changes.
+
+        Returns:
+            pd.DataFrame: Whether the rows of each table (columns) overlap with the rows of each table (index)
+        """
+        table_names = [name for name in self.dfs.keys() if self.dfs.is_loaded(name) and 'mapping' not in name]
+        matrix = pd.DataFrame(True, index=table_names, columns=table_names)
+        for name1 in table_names:
+            for name2 in table_names:
+                if name1 != name2 and not self.dfs.dfs[name1].empty:
+                    matrix.loc[name1, name2] = self.__check_tables_overlap__([name1], name2)
+        return matrix
+
+    def __check_tables_overlap__(self, merged: List[str], table_name: str, get_data: Callable = None) -> bool:
+        """
+        Check whether the indices of the join of the merged tables and of a table overlap, as in
+        check_indices_overlap, using cached results. The index of the join is the union of the
+        indices of the merged tables, when they all have the same unique index levels.
+
+        Args:
+            merged (List[str]): The names of the (non-empty) tables that were joined so far.
+            table_name (str): The name of the table to join.
+            get_data (Callable, optional): Returns the joined data, which is checked directly when the cached
+                results do not apply. Defaults to None (join the merged tables).
+
+        Returns:
+            bool: Whether the indices overlap in more then 1% of the rows
+        """
+        df = self.dfs.dfs[table_name]
+        if df.empty:
+            return True
+        encoded = [self.__get_row_keys__(name) for name in merged + [table_name]]
+        if any([keys is None or defined is None for keys, defined, n_defined in encoded]) or \
+                not all([self.dfs.dfs[name].index.is_unique for name in merged]):
+            # the join may not be the union of the indices, so the joined data is checked directly
+            if get_data is not None:
+                data = get_data()
+            else:
+                data = self.dfs.dfs[merged[0]]
+                for name in merged[1:]:
+                    data = data.join(self.dfs.dfs[name], how='outer', rsuffix=name)
+            return self.check_indices_overlap(data, df)
+
+        key = (tuple(merged), table_name)
+        if key not in self.__overlap_cache__:
+            merged_keys = np.concatenate([keys[defined] for keys, defined, n_defined in encoded[:-1]])
+            if len(merged) > 1:
+                merged_keys = np.unique(merged_keys)
+            table_keys = encoded[-1][0][encoded[-1][1]]
+            if len(merged_keys) == 0 or len(table_keys) == 0:
+                overlap = True
+            else:
+                min_cutoff = 0.01
+                is_merged = np.zeros(len(self.row_keys), dtype=bool)
+                is_merged[merged_keys] = True
+                overlap = is_merged[table_keys].sum() > min(len(merged_keys), len(table_keys)) * min_cutoff
+            self.__overlap_cache__[key] = overlap
+        return self.__overlap_cache__[key]
+
+    def __get_row_keys__(self, table_name: str) -> Tuple[Union[np.ndarray, None], Union[np.ndarray, None], int]:
+        """
+        Get the row keys of a table, and which of its rows have a defined research stage.
+        The result is cached, and cached overlaps of the table are discarded when its index changes.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            np.ndarray: The row key of each row, or None if the index of the table cannot be encoded
+            np.ndarray: Whether each row has a defined research stage, or None if the table has no research_stage index level
+            int: The number of rows with a defined research stage
+        """
+        df = self.dfs.dfs[table_name]
+        cached = self.__row_keys__.get(table_name)
+        if cached is not None and cached[0] is df.index:
+            return cached[1:]
+        self.__overlap_cache__ = {key: overlap for key, overlap in self.__overlap_cache__.items()
+                                  if table_name not in key[0] and table_name != key[1]}
+        keys = self.row_keys.encode(df.index)
+        defined = None
+        n_defined = len(df)
+        if self.has_index(df, 'research_stage'):
+            if keys is not None:
+                defined = ~self.row_keys.undefined[keys]
+            else:
+                defined = np.asarray(df.index.get_level_values('research_stage') != 'undefined')
+            n_defined = int(defined.sum())
+        self.__row_keys__[table_name] = (df.index, keys, defined, n_defined)
+        return keys, defined, n_defined
     
-    def build_table_to_field_dict(self, data, fields, join_non_overlapping):
+    def build_table_to_field_dict(self, data, fields, join_non_overlapping, table_names=None):
         ''' 
         Build a dictionary of tables to fields of interest.
         '''
+        if table_names is None:
+            table_names = list(self.dfs.keys())
         ## pre_check for duplicated columns and overlapping indices
         fields_of_interest_dict = dict()
-        for table_name, df in self.dfs.items():
+        for table_name in table_names:
+            df = self.__get_table__(table_name, fields)
+            if df is None:
+                continue
             fields_of_interest = df.columns.intersection(fields)
             if self.check_indices_overlap(data, df[fields_of_interest]) or join_non_overlapping: 
                 fields_of_interest_dict[table_name] = fields_of_interest
@@ -403,7 +1301,7 @@ class PhenoLoader:
         not_found = np.setdiff1d(only_merged_fields, data.columns)
         return not_found
 
-    def get(self, fields: Union[str,List[str]], flexible: bool=None, not_bulk_field=False, squeeze: bool=None, return_fields: bool=False, keep_undefined_research_stage: bool=None, join_non_overlapping: bool=None,  **kwargs):
+    def get(self, fields: Union[str,List[str]], flexible: bool=None, not_bulk_field=False, squeeze: bool=None, return_fields: bool=False, keep_undefined_research_stage: bool=None, join_non_overlapping: bool=None, filters: Union[dict, List[tuple]]=None, output_format: str='pandas', **kwargs):
         """
         Return data for the specified fields from all tables
 
@@ -415,6 +1313,15 @@ class PhenoLoader:
             return_fields (bool, optional): Whether to return the list of fields that were found. Defaults to False.
             keep_undefined_research_stage (bool, optional): Whether to keep samples with undefined research stage. Defaults to None, which uses the PhenoLoader's keep_undefined_research_stage attribute.
             join_non_overlapping (bool, optional): Whether to join tables with non-overlapping indices. Defaults to None, which uses the PhenoLoader's join_non_overlapping attribute.
+            filters (Union[dict, List[tuple]], optional): Filters on the rows of the tables, applied before they are joined.
+                Either a dict of field -> value, where a list of values selects rows with any of the values and a (start, end)
+                tuple selects an inclusive range (either end may be None), or a list of (field, op, value) tuples as in pyarrow.
+                Fields may be index levels (e.g., participant_id, research_stage, array_index) or columns. Each filter applies
+                to the tables that contain its field, and in lazy mode it is pushed down to the parquet scan of tables that
+                were not loaded yet. Defaults to None (no filters).
+            output_format (str, optional): The type of the returned data: 'pandas', 'arrow' for a pyarrow.Table,
+                or 'batches' for a pyarrow.RecordBatchReader. Arrow-backed columns (see dtype_backend) are converted
+                without copying. Defaults to 'pandas'.
             **kwargs: Additional keyword arguments to filter the data based on dictionary properties.
 
         Returns:
@@ -430,71 +1337,195 @@ class PhenoLoader:
             join_non_overlapping = self.join_non_overlapping
         if isinstance(fields, str):
             fields = [fields]
+        filters = self.__get_filter_predicates__(filters)
+        if output_format not in ['pandas', 'arrow', 'batches']:
+            raise ValueError(f"output_format must be 'pandas', 'arrow' or 'batches', got {output_format}")
+
+        args = (fields, flexible, not_bulk_field, squeeze, return_fields, keep_undefined_research_stage, join_non_overlapping,
+                filters)
+        key = None
+        if self.result_cache is not None:
+            key = self.__get_result_key__(*args, **kwargs)
+        if key is None:
+            result = self.__get_data__(*args, **kwargs)
+        else:
+            result = self.result_cache.get(key)
+            if result is None:
+                result = self.__get_data__(*args, **kwargs)
+                self.result_cache.put(key, result)
+        if output_format == 'pandas':
+            return result
+        if return_fields:
+            return self.__to_arrow__(result[0], output_format), result[1]
+        return self.__to_arrow__(result, output_format)
 
-        search_dict = self.dict.copy()
-        if not_bulk_field and 'parent_dataframe' in search_dict.columns:
-            search_dict = search_dict.loc[search_dict['parent_dataframe'].isnull()]
-        for k, v in kwargs.items():
-            if k in search_dict.columns:
-                if isinstance(v, list):
-                    search_dict = search_dict[search_dict[k].isin(v)]
-                else:
-                    search_dict = search_dict[search_dict[k] == v]
+    @staticmethod
+    def __to_arrow__(data: Union[pd.DataFrame, pd.Series], output_format: str) -> Union[pa.Table, pa.RecordBatchReader]:
+        """
+        Convert the result of get() to Arrow, keeping its index as columns.
 
-        matches = fields
-        if flexible:
-            # 1. searching in dictionary, so we can access bulk fields as well as tabular fields
-            # 2. keeping the given fields, so we can access fields (e.g., index levels) that are not in the dictionary
-            # 3. approximate matches will appear after exact matches
-            matches = [search_dict.index[search_dict.index.str.contains(field, case=False)].tolist()
-                       for field in fields]
-            fields = np.hstack(fields + matches)
+        Args:
+            data (Union[pd.DataFrame, pd.Series]): The data.
+            output_format (str): 'arrow' for a pyarrow.Table, or 'batches' for a pyarrow.RecordBatchReader.
 
-        # check whether any field points to a parent_dataframe
+        Returns:
+            Union[pa.Table, pa.RecordBatchReader]: The converted data.
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        table = pa.Table.from_pandas(data)
+        if output_format == 'batches':
+            return pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
+        return table
+
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get the statistics of the cache of results of get().
+
+        Returns:
+            dict: The number of hits and misses, and the number of entries and memory used and allowed.
+        """
+        if self.result_cache is None:
+            return {}
+        return self.result_cache.info()
+
+    def clear_cache(self) -> None:
+        """
+        Clear the cache of results of get(). Should be called after modifying the tables.
+        """
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    @staticmethod
+    def __get_result_key__(*args, **kwargs) -> Union[tuple, None]:
+        """
+        Normalize the arguments of get() to a hashable key for the cache of results.
+
+        Returns:
+            tuple: The key, or None if the arguments cannot be hashed
+        """
+        def normalize(value):
+            if isinstance(value, (list, tuple, np.ndarray, pd.Index)):
+                return tuple([normalize(v) for v in value])
+            return value
+
+        key = tuple([normalize(arg) for arg in args]) + \
+            tuple(sorted([(k, normalize(v)) for k, v in kwargs.items()]))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __get_data__(self, fields: List[str], flexible: bool, not_bulk_field: bool, squeeze: bool, return_fields: bool,
+                     keep_undefined_research_stage: bool, join_non_overlapping: bool, filters: List[tuple], **kwargs):
+        """
+        Return data for the specified fields from all tables, with the arguments of get().
+        """
+        search_dict = self.dict
+        if not_bulk_field and 'parent_dataframe' in search_dict.columns:
+            search_dict = search_dict.loc[search_dict['parent_dataframe'].isnull()]
+        for k, v in kwargs.items():
+            if k in search_dict.columns:
+                if isinstance(v, list):
+                    search_dict = search_dict[search_dict[k].isin(v)]
+                else:
+                    search_dict = search_dict[search_dict[k] == v]
+
+        matches = fields
+        if flexible:
+            # 1. searching in dictionary, so we can access bulk fields as well as tabular fields
+            # 2. keeping the given fields, so we can access fields (e.g., index levels) that are not in the dictionary
+            # 3. approximate matches will appear after exact matches
+            if search_dict is self.dict:
+                matches = [self.field_index.match(field, case=False) for field in fields]
+            else:
+                matches = [search_dict.index[search_dict.index.str.contains(field, case=False)].tolist()
+                           for field in fields]
+            fields = np.hstack(fields + matches)
+
+        # check whether any field points to a parent_dataframe
         seen_fields = set()
         parent_dict = dict()
-        if 'parent_dataframe' in search_dict.columns:
+        if search_dict is self.dict:
+            # the parents of bulk fields are indexed when the dictionary is loaded
+            parent_dict = self.router.parents
+            field_counts = pd.Series([parent for field in dict.fromkeys(fields) for parent in parent_dict.get(field, [])],
+                                     dtype=object).value_counts()
+        elif 'parent_dataframe' in search_dict.columns:
             parent_dict = search_dict.loc[search_dict.index.isin(fields), 'parent_dataframe'].dropna()
-            field_counts = search_dict.loc[search_dict.index.isin(fields), 'parent_dataframe']\
-                .value_counts().dropna().to_frame().reset_index()
-            if len(field_counts):
-                field_counts.apply(lambda x: print(f'{x["count"]}\tbulk fields found in {x["parent_dataframe"]}'), axis=1)
+            field_counts = search_dict.loc[search_dict.index.isin(fields), 'parent_dataframe'].value_counts().dropna()
+        if len(parent_dict):
+            for parent, count in field_counts.items():
+                print(f'{count}\tbulk fields found in {parent}')
         fields = np.hstack([parent_dict.get(field, field) for field in fields])
         fields = [field for field in fields if field not in seen_fields and not seen_fields.add(field)]
 
-        data = pd.DataFrame()
+        # the column slices of the tables are collected first and joined once at the end
+        slices = list()
+        merged = list()
+        data_columns = set()
+        has_rows = False
         not_merged = list()
         renamed_cols = list()
+        empty_slices = list()
         
-        fields_of_interest_dict = self.build_table_to_field_dict(data, fields, join_non_overlapping)
+        table_names = self.__get_table_names__(fields)
+        if filters is None:
+            self.__prefetch_tables__(table_names, fields)
+        # fields that are columns of more than one table are renamed to {table}_{field}
+        duplicated_columns = self.router.get_duplicated_columns(fields, table_names)
+        requested = set(fields)
         
-        for table_name, df in self.dfs.items():
+        for table_name in table_names:
             if 'mapping' in table_name:
                 continue
+            # skip tables whose only matching fields are index levels that were already added
+            table_levels = self.router.table_levels.get(table_name, set())
+            if table_name in self.router.table_columns and \
+                    requested.isdisjoint(self.router.table_columns[table_name]) and \
+                    table_levels.intersection(requested).issubset(data_columns):
+                continue
+            if filters is None:
+                df = self.__get_table__(table_name, fields)
+            else:
+                df = self.__get_filtered_table__(table_name, fields, filters)
+            if df is None:
+                continue
             
-            duplicated_fields = self.get_duplicated_columns(table_name, fields_of_interest_dict)
-            df, fields = self.rename_duplicated_columns(df, table_name, fields, duplicated_fields)
+            duplicated_fields = duplicated_columns.get(table_name, list())
+            if len(duplicated_fields):
+                df, fields = self.rename_duplicated_columns(df, table_name, fields, duplicated_fields)
             
             fields_in_col = df.columns.intersection(fields)
-            fields_in_index = np.setdiff1d(np.intersect1d(df.index.names, fields), data.columns)
+            fields_in_index = np.setdiff1d(np.intersect1d(df.index.names, fields), list(data_columns))
             
             if len(fields_in_col) or len(fields_in_index):
-                if (not join_non_overlapping) and (not self.check_indices_overlap(data, df)):
+                if filters is None:
+                    overlap = lambda: self.__check_tables_overlap__(merged, table_name, lambda: self.__join_slices__(slices))
+                else:
+                    # filtered tables are checked directly, as the cached overlaps are of full tables
+                    overlap = lambda: self.check_indices_overlap(self.__join_slices__(slices, use_row_keys=False), df)
+                if (not join_non_overlapping) and has_rows and (not overlap()):
                     warnings.warn(f'No overlap between tables, this merge is not recommended. Please view tables separately.\
                         This warning occurred while attempting to add columns from {table_name} to the rest of the data.')
                     
                     not_merged += list(fields_in_col) + list(fields_in_index)
                     continue
             
-            index_data_df = pd.DataFrame()
             if len(fields_in_index):
+                index_data_df = pd.DataFrame()
                 for field in fields_in_index:
                     index_data_df[field] = df.index.get_level_values(field)
                 index_data_df = index_data_df.set_index(df.index)
-            
-            df_fields = pd.concat([df[fields_in_col], index_data_df], axis=1)
+                df_fields = pd.concat([df[fields_in_col], index_data_df], axis=1)
+            else:
+                df_fields = df[fields_in_col]
             
             if df_fields.empty:
+                if filters is not None and len(df_fields.columns):
+                    # tables without matching rows still add their columns, as when filtering the joined data
+                    empty_slices.append(df_fields)
                 continue
             
             if table_name == 'age_sex':
@@ -506,13 +1537,15 @@ class PhenoLoader:
                 keep_undefined = keep_undefined_research_stage
                 how = 'outer'
                 
-            data = self.__concat__(
-                data, 
-                df_fields, 
-                keep_undefined, 
-                how
-                )
+            slices.append((table_name, df_fields, keep_undefined, how))
+            start, _, has_rows = self.__plan_join__(slices, use_row_keys=filters is None)
+            merged = [name for i, (name, _, _, how) in enumerate(slices[start:]) if i == 0 or how == 'outer']
+            data_columns = set().union(*[s[1].columns for s in slices[start:]])
             renamed_cols += duplicated_fields
+
+        data = self.__join_slices__(slices, use_row_keys=filters is None)
+        if len(empty_slices):
+            data = pd.concat([data] + [df.reindex(data.index) for df in empty_slices], axis=1)
             
         if len(data):
             data = data.loc[:, ~data.columns.duplicated()]
@@ -536,6 +1569,319 @@ class PhenoLoader:
 
         return data[cols_order]
     
+    def __get_table_names__(self, fields: List[str]) -> List[str]:
+        """
+        Get the names of the tables that should be searched for the given fields,
+        that is, tables that contain any of the fields as a column or an index level.
+
+        Args:
+            fields (List[str]): The requested fields.
+
+        Returns:
+            List[str]: The table names, in the order of self.dfs.
+        """
+        self.router.sync(self.dfs)
+        table_names = self.router.get_tables(fields)
+        unmatched = [field for field in fields
+                     if field not in self.router.columns and field not in self.router.index_levels]
+        if self.lazy and len(unmatched):
+            # fields that could not be routed (e.g., when a parquet schema could not be read) are searched
+            # in loaded tables, or in the first table if none were loaded yet
+            loaded = [name for name in self.dfs.keys() if self.dfs.is_loaded(name)]
+            if len(loaded) == 0:
+                loaded = [name for name in self.dfs.keys() if name != 'age_sex'][:1]
+            table_names.update(loaded)
+        return [name for name in self.dfs.keys() if name in table_names]
+
+    def __prefetch_tables__(self, table_names: List[str], fields: List[str]) -> None:
+        """
+        In lazy mode, load the requested tables (or columns) that were not loaded yet concurrently.
+
+        Args:
+            table_names (List[str]): The names of the tables.
+            fields (List[str]): The requested fields.
+        """
+        if not self.lazy:
+            return
+        # age_sex is computed from the other tables, so it is not loaded concurrently with them
+        table_names = [name for name in table_names if name != 'age_sex']
+        if not self.project_columns:
+            table_names = [name for name in table_names if not self.dfs.is_loaded(name)]
+        if len(table_names) > 1:
+            self.__map__(lambda name: self.__get_table__(name, fields), table_names)
+
+    def __map__(self, func: Callable, *iterables) -> list:
+        """
+        Apply a function to every item, using a thread pool of n_jobs workers.
+        Results are returned in the order of the input, and the first exception raised
+        (in input order) is propagated.
+
+        Args:
+            func (callable): The function to apply.
+            *iterables: The items to apply the function to.
+
+        Returns:
+            list: The results.
+        """
+        n_jobs = os.cpu_count() if self.n_jobs in [None, -1] else self.n_jobs
+        if n_jobs is None or n_jobs <= 1:
+            return list(map(func, *iterables))
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return list(executor.map(func, *iterables))
+
+    @staticmethod
+    def __map_bulk__(load_func: Callable, paths: List[str], kwargs: dict, n_jobs: int,
+                     executor: Union[str, Executor]) -> Iterator[Tuple[Any, Union[Exception, None]]]:
+        """
+        Load bulk files, concurrently with n_jobs workers of a thread or process pool or with a given executor.
+        Up to 2 * n_jobs files are loaded ahead of the file that is yielded.
+
+        Args:
+            load_func (callable): The function that loads a file.
+            paths (List[str]): The paths of the files.
+            kwargs (dict): Keyword arguments of load_func.
+            n_jobs (int): The number of workers, where -1 uses all CPUs, and 1 loads files serially (unless an executor is given).
+            executor (str or Executor): 'thread', 'process', or an Executor.
+
+        Returns:
+            Iterator[Tuple[Any, Union[Exception, None]]]: The loaded data and the exception raised by the load (or None)
+                of each file, in the order of the paths.
+        """
+        load = functools.partial(load_func, **kwargs)
+        n_jobs = os.cpu_count() if n_jobs in [None, -1] else n_jobs
+        if not isinstance(executor, Executor):
+            if executor not in ['thread', 'process']:
+                raise ValueError(f"executor must be 'thread', 'process' or an Executor, got {executor}")
+            if n_jobs <= 1:
+                for p in paths:
+                    try:
+                        result = load(p), None
+                    except Exception as e:
+                        result = None, e
+                    yield result
+                return
+
+        pool = executor
+        if not isinstance(executor, Executor):
+            pool = (ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor)(max_workers=n_jobs)
+        paths = iter(paths)
+        futures = deque()
+        try:
+            for p in paths:
+                futures.append(pool.submit(load, p))
+                if len(futures) >= 2 * max(n_jobs, 1):
+                    break
+            while futures:
+                future = futures.popleft()
+                for p in paths:
+                    futures.append(pool.submit(load, p))
+                    break
+                try:
+                    result = future.result(), None
+                except Exception as e:
+                    result = None, e
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            if pool is not executor:
+                pool.shutdown(wait=False)
+
+    def __get_table__(self, table_name: str, fields: List[str]) -> pd.DataFrame:
+        """
+        Get a table for the given fields. When projecting columns, only the requested fields
+        that were not loaded yet are read from the table.
+
+        Args:
+            table_name (str): The name of the table.
+            fields (List[str]): The requested fields.
+
+        Returns:
+            pd.DataFrame: The table, or None if it could not be loaded.
+        """
+        try:
+            if self.project_columns:
+                return self.dfs.get_columns(table_name, fields)
+            return self.dfs[table_name]
+        except KeyError:
+            return None
+
+    def __get_filtered_table__(self, table_name: str, fields: List[str], filters: List[tuple]) -> pd.DataFrame:
+        """
+        Get the rows of a table that match the filters. In lazy mode, tables that were not loaded yet
+        are read with the filters pushed down to the parquet scan, and are not kept in memory.
+
+        Args:
+            table_name (str): The name of the table.
+            fields (List[str]): The requested fields.
+            filters (List[tuple]): The (field, op, value) filters.
+
+        Returns:
+            pd.DataFrame: The filtered table, or None if it could not be loaded.
+        """
+        relative_location = self.__table_locations__.get(table_name)
+        if self.lazy and relative_location is not None and not self.dfs.is_loaded(table_name):
+            columns = None
+            if self.project_columns and table_name in self.dfs.columns:
+                columns = [col for col in self.dfs.columns[table_name] if col in fields]
+            df = self.__load_table__(relative_location, table_name, columns,
+                                     filters=self.__get_pushdown_filters__(relative_location, filters))
+        else:
+            df = self.__get_table__(table_name, fields)
+        if df is None:
+            return None
+        return self.__apply_filters__(df, filters)
+
+    def __get_pushdown_filters__(self, relative_location: str, filters: List[tuple]) -> List[tuple]:
+        """
+        Get the filters that can be pushed down to the parquet scan of a table, with values
+        converted to the types of the parquet schema. Filters on fields that are translated
+        from a data coding are applied only after loading.
+
+        Args:
+            relative_location (str): the location of the dataframe
+            filters (List[tuple]): The (field, op, value) filters.
+
+        Returns:
+            List[tuple]: The filters to push down.
+        """
+        try:
+            schema = pq.read_schema(os.path.join(self.dataset_path, relative_location))
+        except Exception:
+            return []
+        coded = set()
+        if 'data_coding' in self.dict.columns:
+            coded = set(self.dict.index[self.dict['data_coding'].notnull()])
+        pushdown = list()
+        for field, op, value in filters:
+            if field not in schema.names or field in coded:
+                continue
+            dtype = schema.field(field).type
+            if pa.types.is_dictionary(dtype):
+                dtype = dtype.value_type
+            try:
+                if op in ['in', 'not in']:
+                    value = [self.__convert_filter_value__(v, dtype) for v in value]
+                else:
+                    value = self.__convert_filter_value__(value, dtype)
+            except (TypeError, ValueError):
+                continue
+            pushdown.append((field, op, value))
+        return pushdown
+
+    @staticmethod
+    def __convert_filter_value__(value, dtype: pa.DataType):
+        """
+        Convert a filter value to a parquet type.
+
+        Args:
+            value: The value.
+            dtype (pa.DataType): The parquet type.
+
+        Returns:
+            The converted value. Raises TypeError or ValueError if it cannot be converted.
+        """
+        if pa.types.is_timestamp(dtype):
+            value = pd.Timestamp(value)
+            if dtype.tz is not None and value.tz is None:
+                return value.tz_localize(dtype.tz)
+            if dtype.tz is None and value.tz is not None:
+                return value.tz_convert(None)
+            return value
+        if pa.types.is_integer(dtype):
+            if isinstance(value, (bool, np.bool_)) or int(value) != value:
+                raise ValueError(f'{value} is not an integer')
+            return int(value)
+        if pa.types.is_floating(dtype) and not isinstance(value, (str, bool)):
+            return float(value)
+        if (pa.types.is_string(dtype) or pa.types.is_large_string(dtype)) and isinstance(value, str):
+            return value
+        raise TypeError(f'{value} cannot be compared with {dtype}')
+
+    @staticmethod
+    def __apply_filters__(df: pd.DataFrame, filters: List[tuple]) -> pd.DataFrame:
+        """
+        Filter the rows of a table in memory. Filters on fields that are neither columns
+        nor index levels of the table are ignored, and missing values never match.
+
+        Args:
+            df (pd.DataFrame): The table.
+            filters (List[tuple]): The (field, op, value) filters.
+
+        Returns:
+            pd.DataFrame: The filtered table.
+        """
+        mask = np.ones(len(df), dtype=bool)
+        for field, op, value in filters:
+            if field in df.columns:
+                values = df[field]
+            elif field in df.index.names:
+                values = pd.Series(df.index.get_level_values(field), index=df.index)
+            else:
+                continue
+            is_arrow_timestamp = isinstance(values.dtype, pd.ArrowDtype) and pa.types.is_timestamp(values.dtype.pyarrow_dtype)
+            if is_arrow_timestamp or pd.api.types.is_datetime64_any_dtype(values):
+                tz = values.dtype.pyarrow_dtype.tz if is_arrow_timestamp else getattr(values.dtype, 'tz', None)
+                def to_timestamp(v):
+                    v = pd.Timestamp(v)
+                    if tz is not None and v.tz is None:
+                        return v.tz_localize(tz)
+                    if tz is None and v.tz is not None:
+                        return v.tz_convert(None)
+                    return v
+                value = [to_timestamp(v) for v in value] if op in ['in', 'not in'] else to_timestamp(value)
+            if op == 'in':
+                matches = values.isin(list(value))
+            elif op == 'not in':
+                matches = ~values.isin(list(value))
+            else:
+                matches = {'==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+                           '>': operator.gt, '>=': operator.ge}[op](values, value)
+            mask &= np.asarray(matches & values.notnull(), dtype=bool)
+        if mask.all():
+            return df
+        return df.loc[mask]
+
+    @staticmethod
+    def __get_filter_predicates__(filters: Union[dict, List[tuple], None]) -> Union[tuple, None]:
+        """
+        Normalize the filters of get() to (field, op, value) tuples, as used by pyarrow.
+
+        Args:
+            filters (Union[dict, List[tuple]]): A dict of field -> value, list of values or (start, end) range,
+                or a list of (field, op, value) tuples.
+
+        Returns:
+            tuple: The (field, op, value) filters, or None if there are no filters.
+        """
+        if filters is None:
+            return None
+        predicates = list()
+        if isinstance(filters, dict):
+            for field, value in filters.items():
+                if isinstance(value, tuple):
+                    if len(value) != 2:
+                        raise ValueError(f'Range filter of {field} should be a (start, end) tuple, got {value}')
+                    if value[0] is not None:
+                        predicates.append((field, '>=', value[0]))
+                    if value[1] is not None:
+                        predicates.append((field, '<=', value[1]))
+                elif isinstance(value, (list, set, np.ndarray, pd.Index, pd.Series)):
+                    predicates.append((field, 'in', tuple(value)))
+                else:
+                    predicates.append((field, '==', value))
+        else:
+            for predicate in filters:
+                if len(predicate) != 3 or predicate[1] not in ['==', '=', '!=', '<', '<=', '>', '>=', 'in', 'not in']:
+                    raise ValueError(f'Invalid filter: {predicate}')
+                field, op, value = predicate
+                if op in ['in', 'not in']:
+                    value = tuple(value)
+                predicates.append((field, '==' if op == '=' else op, value))
+        if len(predicates) == 0:
+            return None
+        return tuple(predicates)
+
     def replace_bulk_data_path(self, data, fields):
         bulk_field_types = self.dict_prop.loc[self.dict_prop.is_bulk == True].index.to_list()
         bulk_fields = self.dict.loc[self.dict.index.isin(fields)].query('field_type in @bulk_field_types')
@@ -585,10 +1931,178 @@ class PhenoLoader:
         
         return df1.join(df2, how=how, lsuffix=lsuffix, rsuffix=rsuffix)
     
+    def __plan_join__(self, slices: List[tuple], use_row_keys: bool = True) -> Tuple[int, List[bool], bool]:
+        """
+        Simulate joining the column slices of tables one by one with __concat__, using the cached
+        row keys of the tables, without joining any data.
+
+        Args:
+            slices (List[tuple]): The (table_name, df, keep_undefined_research_stage, how) of each table, in join order.
+            use_row_keys (bool): Whether the slices have the rows of the full tables, so that their cached row keys
+                can be used. Otherwise, the research stages are counted in the slices. Defaults to True.
+
+        Returns:
+            int: The position of the first slice in the joined data (earlier slices are dropped when the data becomes empty)
+            List[bool]: Whether rows with an undefined research stage are filtered when joining each slice
+            bool: Whether the joined data has any rows
+        """
+        start = 0
+        events = [False] * len(slices)
+        has_rows = has_defined = has_undefined = False
+        for i, (table_name, df, keep_undefined, how) in enumerate(slices):
+            if use_row_keys:
+                keys, defined, n_defined = self.__get_row_keys__(table_name)
+            else:
+                n_defined = len(df)
+                if self.has_index(df, 'research_stage'):
+                    n_defined = int((df.index.get_level_values('research_stage') != 'undefined').sum())
+            any_undefined = n_defined < len(df)
+            any_defined = n_defined > 0
+            if not has_rows:
+                start, has_rows, has_defined, has_undefined = i, True, any_defined, any_undefined
+            elif has_undefined and any_undefined and not keep_undefined:
+                events[i] = True
+                has_defined = has_defined or (any_defined and how == 'outer')
+                has_rows, has_undefined = has_defined, False
+            elif how == 'outer':
+                has_defined = has_defined or any_defined
+                has_undefined = has_undefined or any_undefined
+        return start, events, has_rows
+
+    def __join_slices__(self, slices: List[tuple], use_row_keys: bool = True) -> pd.DataFrame:
+        """
+        Join the column slices of tables, equivalent to joining them one by one with __concat__.
+        When the row keys of all slices are unique, the joined row keys are computed and sorted once,
+        all slices are aligned to them in a single step, and they are decoded to an index.
+
+        Args:
+            slices (List[tuple]): The (table_name, df, keep_undefined_research_stage, how) of each table, in join order.
+            use_row_keys (bool): Whether the slices have the rows of the full tables, so that their cached row keys
+                can be used. Otherwise (e.g., for filtered tables), the slices are joined one by one. Defaults to True.
+
+        Returns:
+            pd.DataFrame: The joined data
+        """
+        if len(slices) == 0:
+            return pd.DataFrame()
+        start, events, has_rows = self.__plan_join__(slices, use_row_keys)
+        if len(slices) - start == 1:
+            return slices[start][1]
+
+        joined = None
+        if has_rows and use_row_keys:
+            joined = self.__get_joined_keys__(slices[start:], events[start:])
+        if joined is None:
+            data = pd.DataFrame()
+            for table_name, df, keep_undefined, how in slices:
+                data = self.__concat__(data, df, keep_undefined, how)
+            return data
+
+        keys, index = joined
+        if index is None:
+            index = self.row_keys.decode(keys)
+        slices, events = slices[start:], events[start:]
+        encoded = [self.__get_row_keys__(table_name) for table_name, df, keep_undefined, how in slices]
+        # rows with an undefined research stage are dropped from all slices up to the last filtering
+        last_event = max([i for i, event in enumerate(events) if event], default=-1)
+        undefined = [slice_keys[~defined] if last_event >= 0 else None for slice_keys, defined, n_defined in encoded]
+        aligned = list()
+        for i, (table_name, df, keep_undefined, how) in enumerate(slices):
+            if events[i]:
+                warnings.warn('filtering "undefined" research_stage..')
+            slice_keys, defined, n_defined = encoded[i]
+            positions = self.row_keys.get_lookup(slice_keys, defined if i <= last_event else None)[keys]
+            if (positions < 0).any():
+                # missing rows are filled as in DataFrame.reindex
+                df = df.set_axis(pd.RangeIndex(len(df)), axis=0, copy=False).reindex(positions)
+            elif len(positions) != len(df) or (positions != np.arange(len(df))).any():
+                df = df.iloc[positions]
+            df = df.set_axis(index, axis=0, copy=False)
+            if last_event >= 0 and self.__is_missing_undefined__(i, slices, events, undefined):
+                # rows that were filtered later were still missing from this slice in an intermediate join
+                df = df.astype({col: object if pd.api.types.is_bool_dtype(dtype) else 'float64'
+                                for col, dtype in df.dtypes.items()
+                                if isinstance(dtype, np.dtype) and dtype.kind in 'biu'})
+            aligned.append(df)
+        return pd.concat(aligned, axis=1)
+
+    @staticmethod
+    def __is_missing_undefined__(i: int, slices: List[tuple], events: List[bool], undefined: List[np.ndarray]) -> bool:
+        """
+        Check whether the joined data had rows with an undefined research stage that are missing from
+        a slice, at any step of joining the slices one by one after the slice was joined.
+
+        Args:
+            i (int): The position of the slice.
+            slices (List[tuple]): The (table_name, df, keep_undefined_research_stage, how) of each table, in join order.
+            events (List[bool]): Whether rows with an undefined research stage are filtered when joining each slice.
+            undefined (List[np.ndarray]): The row keys with an undefined research stage of each slice.
+
+        Returns:
+            bool: Whether undefined rows were missing from the slice
+        """
+        present = list()
+        for k in range(len(slices)):
+            if k > 0 and slices[k][3] != 'outer':
+                continue
+            if k >= i:
+                # joined after the slice, unless they were filtered right away
+                if events[k]:
+                    continue
+                if any(events[i:k + 1]) and len(undefined[k]):
+                    # the undefined rows of the slice were already filtered
+                    return True
+                present.append(undefined[k])
+            elif not any(events[k:i + 1]):
+                # joined before the slice, and not filtered until the slice was joined
+                present.append(undefined[k])
+        if len(present) == 0:
+            return False
+        return not np.isin(np.concatenate(present), undefined[i]).all()
+
+    def __get_joined_keys__(self, slices: List[tuple], events: List[bool]) -> Union[Tuple[np.ndarray, Union[pd.Index, None]], None]:
+        """
+        Get the row keys of the join of the column slices of tables, as computed by __concat__.
+
+        Args:
+            slices (List[tuple]): The (table_name, df, keep_undefined_research_stage, how) of each table, in join order.
+            events (List[bool]): Whether rows with an undefined research stage are filtered when joining each slice.
+
+        Returns:
+            np.ndarray: The joined row keys
+            pd.Index: The joined index if it is the index of the first slice, otherwise None
+            Returns None if the slices must be joined one by one (index that cannot be encoded or is not
+            unique, left joins followed by outer joins, or an unsorted index).
+        """
+        encoded = [self.__get_row_keys__(table_name) for table_name, df, keep_undefined, how in slices]
+        for i, (table_name, df, keep_undefined, how) in enumerate(slices):
+            if encoded[i][0] is None or not df.index.is_unique:
+                return None
+            if 0 < i and how == 'left' and (events[i] or (i < len(slices) - 1 and slices[i + 1][3] == 'outer')):
+                return None
+
+        # rows with an undefined research stage are dropped from all slices up to the last filtering
+        last_event = max([i for i, event in enumerate(events) if event], default=-1)
+        outer = [i for i, s in enumerate(slices) if i == 0 or s[3] == 'outer']
+        first = encoded[0][0]
+        # outer joins keep the order of equal indices, and otherwise sort them
+        if last_event < 0 and all([np.array_equal(encoded[i][0], first) for i in outer]):
+            return first, slices[0][1].index
+        if not all([slices[i][1].index.is_monotonic_increasing for i in outer]):
+            return None
+        keys = np.concatenate([encoded[i][0][encoded[i][1]] if i <= last_event else encoded[i][0]
+                               for i in outer])
+        return self.row_keys.sort(np.unique(keys)), None
+
     def merge_all_tables(self) -> pd.DataFrame:
         # merge all tables in self.dfs dictionary
         align_df = None
-        for name, df in self.dfs.items():
+        for name in self.dfs.keys():
+            if name == 'age_sex':
+                continue
+            df = self.dfs.get(name)
+            if df is None:
+                continue
             if align_df is None:
                 align_df = df
             else:
@@ -599,18 +2113,32 @@ class PhenoLoader:
     def __load_age_sex__(self) -> None:
         """
         Add sex and compute age from birth date.
+        Age and sex are computed only when they are first requested.
+        """
+        self.fields += ['age', 'sex']
+        self.dfs.add_loader('age_sex', self.__compute_age_sex__)
+        self.router.add_table('age_sex', ['age', 'sex'])
+
+    def __compute_age_sex__(self) -> pd.DataFrame:
+        """
+        Compute the age_sex table for all samples in the dataset.
+
+        Returns:
+            pd.DataFrame: age and sex for each sample
         """
         age_path = os.path.join(self.__get_dataset_path__(self.age_sex_dataset), 'events.parquet')
         
-        if len(self.dfs) > 1: 
-            align_df = self.merge_all_tables()
-        else: 
-            align_df = self.dfs[list(self.dfs)[0]]
+        # only the index and the columns used below are read from the tables
+        date_cols = np.array(['collection_date', 'collection_timestamp', 'sequencing_date'])
+        align_df = self.__get_age_sex_index__(['research_stage', 'age_at_research_stage', 'sex'], date_cols)
+        if self.dtype_backend is not None:
+            # ages are computed from NumPy-backed dates
+            align_df = pd.DataFrame({col: convert_from_arrow(align_df[col]) for col in align_df.columns}, index=align_df.index)
         
         if ('research_stage' in align_df.columns) or ('research_stage' in align_df.index.names):
             try:
-                age_df = pd.read_parquet(age_path)
-                self.dfs['age_sex'] = align_df.join(
+                age_df = pd.read_parquet(age_path, columns=['age_at_research_stage', 'sex'])
+                age_sex = align_df.join(
                     age_df[['age_at_research_stage', 'sex']].droplevel('array_index'))\
                     .rename(columns={'age_at_research_stage': 'age'})[['age', 'sex']]
 
@@ -619,27 +2147,25 @@ class PhenoLoader:
                     raise(e)
                 elif self.errors == 'warn':
                     warnings.warn(f'Error joining research_stage: {e}')
-                self.dfs['age_sex'] = pd.DataFrame(index=align_df.index).assign(age=np.nan, sex=np.nan)
+                age_sex = pd.DataFrame(index=align_df.index).assign(age=np.nan, sex=np.nan)
 
         else:
             # init an empty df
-            self.dfs['age_sex'] = pd.DataFrame(index=align_df.index).assign(age=np.nan, sex=np.nan)
+            age_sex = pd.DataFrame(index=align_df.index).assign(age=np.nan, sex=np.nan)
 
-        self.fields += ['age', 'sex']
-        ind = self.dfs['age_sex'].isnull().any(axis=1)
+        ind = age_sex.isnull().any(axis=1)
         if not ind.any():  # no missing values
-            return
+            return age_sex
 
         # fill in missing values by computing age from birth date
         try:
-            date_cols = np.array(['collection_date', 'collection_timestamp', 'sequencing_date'])
             date = date_cols[np.isin(date_cols, align_df.columns)][0]  # prefer first match
         except Exception as e:
             if self.errors == 'raise':
                 raise(e)
             elif self.errors == 'warn':
                 warnings.warn(f'No date field found')
-            return
+            return age_sex
 
         try:
             ind &= align_df[date].notnull()
@@ -648,14 +2174,16 @@ class PhenoLoader:
                 raise(e)
             if self.errors == 'warn':
                 warnings.warn(f'Error checking date field: {e}')
-            return
+            return age_sex
         if not ind.any():
-            return
+            return age_sex
 
-        age_df = pd.read_parquet(age_path.replace('events', 'population'))
+        population_path = age_path.replace('events', 'population')
+        population_columns = pq.read_schema(population_path).names
+        age_df = pd.read_parquet(population_path, columns=[col for col in ['year_of_birth', 'month_of_birth', 'sex']
+                                                           if col in population_columns])
 
         # trying a workaround for a pandas deprecation warning
-        age_sex = self.dfs['age_sex']
         try:
             age_df['birth_date'] = pd.to_datetime(
                 age_df['year_of_birth'].astype(str) + '-' + age_df['month_of_birth'].astype(str))
@@ -676,7 +2204,98 @@ class PhenoLoader:
 
         age_sex['age'] = age_sex['age'].fillna(age_sex['age_miss'])
         age_sex['sex'] = age_sex['sex'].fillna(age_sex['sex_miss'])
-        self.dfs['age_sex'] = age_sex[['age', 'sex']]
+        return age_sex[['age', 'sex']]
+
+    def __get_age_sex_index__(self, columns: List[str], date_cols: List[str]) -> pd.DataFrame:
+        """
+        Get the join of the indices of all tables, as in merge_all_tables, with only the given columns
+        and the first date column found in the joined tables.
+        Tables that were not loaded are read without loading their other columns.
+
+        Args:
+            columns (List[str]): The columns to include, if they exist.
+            date_cols (List[str]): The date columns, in order of preference.
+
+        Returns:
+            pd.DataFrame: The joined data
+        """
+        table_columns = dict()
+        frames = dict()
+        for name in [name for name in self.dfs.keys() if name != 'age_sex']:
+            cols = self.__get_table_column_names__(name)
+            frame = None if cols is None else self.__get_table_frame__(name, [])
+            if frame is None:
+                continue
+            table_columns[name], frames[name] = cols, frame
+
+        # tables that are empty (or follow an empty table) are skipped or replaced, as in __concat__
+        merged = list()
+        merged_empty = False
+        for name, frame in frames.items():
+            is_empty = len(frame) == 0 or len(table_columns[name]) == 0
+            if len(merged) == 0 or merged_empty:
+                merged, merged_empty = [name], is_empty
+            elif not is_empty:
+                merged.append(name)
+        if len(merged) == 0:
+            return None
+
+        merged_columns = set().union(*[table_columns[name] for name in merged])
+        columns = columns + [col for col in date_cols if col in merged_columns][:1]
+        align_df = None
+        for name in merged:
+            cols = [col for col in table_columns[name] if col in columns]
+            frame = frames[name] if len(cols) == 0 else self.__get_table_frame__(name, cols)
+            if align_df is None:
+                align_df = frame
+            else:
+                align_df = align_df.join(frame, how='outer', lsuffix='', rsuffix=name)
+        return align_df
+
+    def __get_table_column_names__(self, table_name: str) -> Union[List[str], None]:
+        """
+        Get the columns of a table, from the loaded table or from its parquet schema.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            List[str]: The columns of the table, or None if it could not be loaded
+        """
+        if table_name in self.dfs.columns:
+            return list(self.dfs.columns[table_name])
+        if not self.dfs.is_loaded(table_name) and table_name in self.__table_locations__:
+            columns, index_levels = self.__get_table_schema__(self.__table_locations__[table_name])
+            if columns is not None:
+                return columns
+        df = self.dfs.get(table_name)
+        if df is None:
+            return None
+        return df.columns.tolist()
+
+    def __get_table_frame__(self, table_name: str, columns: List[str]) -> Union[pd.DataFrame, None]:
+        """
+        Get the index and some of the columns of a table, without loading the table if it was not loaded.
+
+        Args:
+            table_name (str): The name of the table.
+            columns (List[str]): The columns.
+
+        Returns:
+            pd.DataFrame: The index and the columns of the table, or None if it could not be loaded
+        """
+        if table_name in self.dfs.columns:
+            try:
+                df = self.dfs.get_columns(table_name, columns)
+            except KeyError:
+                return None
+        elif self.dfs.is_loaded(table_name) or table_name not in self.__table_locations__:
+            df = self.dfs.get(table_name)
+        else:
+            df = self.__load_table__(self.__table_locations__[table_name], table_name, columns)
+        if df is None:
+            return None
+        return df[columns]
 
     def convert_us_to_ns(self, df):
         """
@@ -695,12 +2314,41 @@ class PhenoLoader:
                 df[col] = df[col].astype('datetime64[ns, Asia/Jerusalem]')
         return df
     
+    @staticmethod
+    def __get_numpy_index__(index: pd.Index) -> pd.Index:
+        """
+        Convert Arrow-backed index levels to the NumPy-backed dtypes that are used when reading
+        parquet files by default, so that tables are joined and encoded to row keys as usual.
+        Only the unique values of each level are converted.
+
+        Args:
+            index (pd.Index): The index.
+
+        Returns:
+            pd.Index: The converted index.
+        """
+        def convert(level):
+            if not isinstance(level.dtype, pd.ArrowDtype):
+                return level
+            return pd.Index(pa.array(level.array).to_pandas().values, name=level.name)
+
+        if isinstance(index, pd.MultiIndex):
+            if not any([isinstance(level.dtype, pd.ArrowDtype) for level in index.levels]):
+                return index
+            return index.set_levels([convert(level) for level in index.levels], verify_integrity=False)
+        return convert(index)
+
     def __load_dataframes__(self) -> None:
         """
         Load all tables in the dataset dictionary.
+        In lazy mode, tables are only registered here and loaded on first access.
         """
-        self.dfs = {}
+        self.dfs = LazyDataFrames()
+        self.router = TableRouter()
+        self.router.set_parents(self.dict)
+        self.__table_locations__ = {}
         self.fields = set()
+        to_load = {}
         for relative_location in self.dict['relative_location'].dropna().unique():
             parquet_name = relative_location.split(os.sep)[-1]
             internal_location = os.sep.join(relative_location.split(os.sep)[1:])
@@ -709,16 +2357,32 @@ class PhenoLoader:
                 
                 (f'Skipping {relative_location}')
                 continue
-            df = self.__load_one_dataframe__(internal_location)
+            table_name = parquet_name.split('.')[0]
+            self.__table_locations__[table_name] = internal_location
+            if self.lazy:
+                # tables are routed by the dictionary and their parquet schema, without loading them
+                table_fields = self.dict.index[self.dict['relative_location'] == relative_location].tolist()
+                columns, index_levels = self.__get_table_schema__(internal_location)
+                self.router.add_table(table_name, table_fields + (columns or []), index_levels)
+                self.dfs.add_loader(
+                    table_name,
+                    lambda columns=None, loc=internal_location, name=table_name: self.__load_table__(loc, name, columns),
+                    columns=columns if self.project_columns else None
+                )
+                # fields are the columns of the table, as when it is loaded
+                self.fields |= set(columns or [])
+                continue
+            to_load[table_name] = internal_location
+
+        # tables are read and translated concurrently, and added in the order of the dictionary
+        loaded = self.__map__(self.__load_table__, to_load.values(), to_load.keys())
+        for table_name, df in zip(to_load, loaded):
             if df is None:
                 continue
-            table_name = parquet_name.split('.')[0]
-            df = self.convert_us_to_ns(df)
             self.dfs[table_name] = df
-            if not df.index.is_unique:
-                print('Warning: index is not unique for', table_name)
             self.fields |= set(self.dfs[table_name].columns.tolist())
         self.fields = sorted(list(self.fields))
+        self.router.sync(self.dfs)
 
         # Merge the data_codings dataframe with the dictionary dataframe
         if 'data_coding' in self.dict.columns:
@@ -728,27 +2392,368 @@ class PhenoLoader:
                 .rename(columns={'data_coding': 'code_number'})\
                 .astype({'code_number': 'str'})\
                 .merge(
-                    self.data_codings.astype({'code_number': 'str'}), 
+                    self.coding_mapping.astype({'code_number': 'str'}), 
                     on='code_number',
                     how='inner'
                 )\
                 .set_index('tabular_field_name')
 
-    def __load_one_dataframe__(self, relative_location: str) -> pd.DataFrame:
+    def __load_table__(self, relative_location: str, table_name: str, columns: List[str] = None,
+                       filters: List[tuple] = None) -> pd.DataFrame:
+        """
+        Load one table and convert its timestamps.
+
+        Args:
+            relative_location (str): the location of the dataframe
+            table_name (str): the name of the table
+            columns (List[str], optional): the columns to load. Defaults to None (all columns).
+            filters (List[tuple], optional): (field, op, value) filters pushed down to the parquet scan.
+                Cached tables are returned unfiltered. Defaults to None.
+
+        Returns:
+            pd.DataFrame: the loaded dataframe
+        """
+        cache_key = self.__get_cache_key__(relative_location)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key, columns, dtype_backend=self.dtype_backend)
+            if cached is not None:
+                df, metadata = cached
+                if self.dtype_backend is not None:
+                    df.index = self.__get_numpy_index__(df.index)
+                self.__update_dictionary__(metadata.get('pandas_dtype', {}))
+                if self.compact_dtypes is not None:
+                    compacted = {col: record for col, record in metadata.get('compaction', {}).items() if col in df.columns}
+                    self.__compaction__.setdefault(table_name, {}).update(compacted)
+                    df = self.__share_index_levels__(table_name, df)
+                return df
+
+        df = self.__load_one_dataframe__(relative_location, columns, filters)
+        if df is None:
+            return None
+        df = self.convert_us_to_ns(df)
+        compacted = {}
+        if self.compact_dtypes is not None:
+            df, compacted = self.__compact_table__(df)
+        if filters:
+            # filtered reads are partial tables, which are neither cached nor checked
+            return df
+        if not df.index.is_unique and not self.dfs.is_loaded(table_name):
+            print('Warning: index is not unique for', table_name)
+        if self.compact_dtypes is not None:
+            self.__compaction__.setdefault(table_name, {}).update(compacted)
+            df = self.__share_index_levels__(table_name, df)
+
+        if cache_key is not None and columns is None:
+            # only full tables are cached, and projected reads are served from them
+            try:
+                pandas_dtypes = self.__get_translated_dtypes__(df)
+                pandas_dtypes.update({col: record[1] for col, record in compacted.items()})
+                self.cache.put(cache_key, df, {'pandas_dtype': pandas_dtypes, 'compaction': compacted})
+            except Exception as err:
+                if self.errors in ['raise', 'warn']:
+                    warnings.warn(f'Error caching {relative_location}:\n{err}')
+        return df
+
+    def __get_cache_key__(self, relative_location: str) -> Union[str, None]:
+        """
+        Get the cache key of a table, based on the fingerprints of its source files
+        and all the parameters that affect its content.
+
+        Args:
+            relative_location (str): the location of the dataframe
+
+        Returns:
+            str: the cache key, or None if the table cannot be cached
+        """
+        if self.cache is None:
+            return None
+        df_path = os.path.join(self.dataset_path, relative_location)
+        source = get_file_fingerprint(df_path)
+        if source is None:
+            return None
+        return self.cache.make_key(
+            path=os.path.abspath(df_path),
+            source=source,
+            dictionary=get_file_fingerprint(self.__get_dictionary_file_path__(self.dataset)),
+            data_coding=get_file_fingerprint(DATA_CODING_PATH),
+            preferred_language=self.preferred_language,
+            unique_index=self.unique_index,
+            valid_dates=self.valid_dates,
+            valid_stage=self.valid_stage,
+            read_parquet_kwargs=self.read_parquet_kwargs,
+            dtype_backend=self.dtype_backend,
+            compact_dtypes=self.compact_dtypes
+        )
+
+    def __compact_table__(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, list]]:
+        """
+        Downcast the numeric columns of a table according to compact_dtypes, and update their dtypes in the dictionary.
+
+        Args:
+            df (pd.DataFrame): The table.
+
+        Returns:
+            pd.DataFrame: The compacted table
+            dict: The dtype and memory in bytes before and after compaction, of each compacted column
+        """
+        compacted = {}
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            dtype = self.__get_compact_dtype__(series, self.compact_dtypes)
+            if dtype is None:
+                continue
+            before = [str(series.dtype), int(series.memory_usage(index=False))]
+            series = series.astype(dtype)
+            df.isetitem(i, series)
+            compacted[col] = [before[0], str(dtype), before[1], int(series.memory_usage(index=False))]
+        self.__update_dictionary__({col: record[1] for col, record in compacted.items()})
+        return df, compacted
+
+    @staticmethod
+    def __get_compact_dtype__(series: pd.Series, policy: str) -> Any:
+        """
+        Get the smallest dtype of the same kind (and backend) that holds the values of a numeric column.
+
+        Args:
+            series (pd.Series): The column.
+            policy (str): 'lossless', or 'float32' to downcast floats even when values change.
+
+        Returns:
+            The compact dtype, or None if the column cannot be compacted.
+        """
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype) or \
+                isinstance(dtype, pd.CategoricalDtype) or getattr(dtype, 'itemsize', 0) <= 1:
+            return None
+
+        def make_dtype(kind, bits):
+            if isinstance(dtype, pd.ArrowDtype):
+                return pd.ArrowDtype(getattr(pa, f'{kind}{bits}')())
+            if isinstance(dtype, np.dtype):
+                return np.dtype(f'{kind}{bits}')
+            return pd.api.types.pandas_dtype(f'{kind.capitalize()}{bits}')  # nullable dtypes
+
+        if pd.api.types.is_integer_dtype(dtype):
+            values = series.dropna()
+            if len(values) == 0:
+                return None
+            kind = 'uint' if pd.api.types.is_unsigned_integer_dtype(dtype) else 'int'
+            low, high = values.min(), values.max()
+            for bits in [8, 16, 32]:
+                if bits >= dtype.itemsize * 8:
+                    return None
+                info = np.iinfo(f'{kind}{bits}')
+                if info.min <= low and high <= info.max:
+                    return make_dtype(kind, bits)
+            return None
+
+        if pd.api.types.is_float_dtype(dtype) and dtype.itemsize > 4:
+            values = series.to_numpy(dtype='float64', na_value=np.nan)
+            compact = values.astype(np.float32)
+            if not np.array_equal(np.isfinite(compact), np.isfinite(values)):
+                return None  # out of the range of float32
+            if policy == 'lossless' and not np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                return None
+            return make_dtype('float', 32)
+        return None
+
+    def __share_index_levels__(self, table_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the index levels of a table with equal levels of previously loaded tables, so that they are stored once.
+        The codes of index levels are already stored with the smallest integer type.
+
+        Args:
+            table_name (str): The name of the table.
+            df (pd.DataFrame): The table.
+
+        Returns:
+            pd.DataFrame: The table with shared index levels.
+        """
+        if not isinstance(df.index, pd.MultiIndex):
+            return df
+        levels = list(df.index.levels)
+        shared = False
+        for i, level in enumerate(levels):
+            candidates = self.__index_levels__.setdefault(level.name, [])
+            match = [other for other in candidates
+                     if len(other) == len(level) and other.dtype == level.dtype and other.equals(level)]
+            if len(match) == 0:
+                # a few distinct levels are kept per name, e.g., for tables of different cohorts
+                candidates.append(level)
+                del candidates[:-8]
+                continue
+            if match[0] is not level:
+                levels[i] = match[0]
+                shared = True
+                self.__compaction__.setdefault(table_name, {})[f'{level.name} (index level)'] = \
+                    [str(level.dtype), str(level.dtype), int(level.memory_usage(deep=True)), 0]
+        if shared:
+            df.index = df.index.set_levels(levels, verify_integrity=False)
+        return df
+
+    def compaction_report(self, per_column: bool = False) -> pd.DataFrame:
+        """
+        Report the memory saved by compacting the dtypes of loaded tables (see compact_dtypes).
+
+        Args:
+            per_column (bool): Whether to report each compacted column and shared index level. Defaults to False (per table).
+
+        Returns:
+            pd.DataFrame: The memory in bytes before and after compaction, and the bytes saved.
+        """
+        report = pd.DataFrame([[table_name, col] + record for table_name, columns in self.__compaction__.items()
+                               for col, record in columns.items()],
+                              columns=['table', 'column', 'dtype_before', 'dtype_after', 'bytes_before', 'bytes_after'])
+        report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+        if per_column:
+            return report.set_index(['table', 'column'])
+        return report.groupby('table')[['bytes_before', 'bytes_after', 'bytes_saved']].sum()
+
+    def memory_report(self, per_column: bool = True) -> pd.DataFrame:
+        """
+        Report the deep memory usage of the loaded tables, with the estimated memory of each column
+        when compacted (see compact_dtypes) and when Arrow-backed (see dtype_backend).
+        Tables that were not loaded yet (in lazy mode) are not loaded.
+
+        Args:
+            per_column (bool): Whether to report each column and index level. Defaults to True (otherwise per table).
+
+        Returns:
+            pd.DataFrame: The dtype and memory in bytes of each column and index level.
+        """
+        report = [self.__get_memory_usage__(table_name, df) for table_name, df in list(self.dfs.dfs.items())]
+        return self.__summarize_memory_usage__(report, per_column)
+
+    @staticmethod
+    def __summarize_memory_usage__(report: List[pd.DataFrame], per_column: bool) -> pd.DataFrame:
+        """
+        Concatenate the memory usage of tables, as returned by memory_report().
+        """
+        columns = ['table', 'column', 'kind', 'dtype', 'bytes', 'compacted_bytes', 'arrow_bytes']
+        report = pd.concat([pd.DataFrame(columns=columns)] + report, ignore_index=True)\
+            .astype({col: 'float64' for col in columns[-3:]})
+        if per_column:
+            return report.set_index(['table', 'column'])
+        return report.groupby('table', sort=False)[columns[-3:]].sum(min_count=1)
+
+    @staticmethod
+    def __get_memory_usage__(table_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Get the memory usage of the columns and index levels of a table.
+
+        Args:
+            table_name (str): The name of the table.
+            df (pd.DataFrame): The table.
+
+        Returns:
+            pd.DataFrame: The dtype and memory in bytes of each column and index level, as in memory_report().
+        """
+        def arrow_bytes(values):
+            try:
+                return pa.array(values, from_pandas=True).nbytes
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                return np.nan
+
+        rows = []
+        index = df.index
+        if isinstance(index, pd.MultiIndex):
+            # levels hold the unique values, and codes map rows to them
+            for level, codes in zip(index.levels, index.codes):
+                nbytes = level.memory_usage(deep=True) + codes.nbytes
+                try:
+                    arrow = pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), pa.array(level)).nbytes
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                    arrow = np.nan
+                rows.append([level.name, 'index level', str(level.dtype), nbytes, nbytes, arrow])
+        else:
+            nbytes = index.memory_usage(deep=True)
+            rows.append([index.name, 'index', str(index.dtype), nbytes, nbytes, arrow_bytes(index)])
+
+        for i, col in enumerate(df.columns):
+            series = df.iloc[:, i]
+            nbytes = series.memory_usage(deep=True, index=False)
+            compacted = nbytes
+            dtype = PhenoLoader.__get_compact_dtype__(series, 'lossless')
+            if dtype is not None:
+                compacted = series.astype(dtype).memory_usage(deep=True, index=False)
+            arrow = nbytes if isinstance(series.dtype, pd.ArrowDtype) else arrow_bytes(series)
+            rows.append([col, 'column', str(series.dtype), nbytes, compacted, arrow])
+
+        return pd.DataFrame(rows, columns=['column', 'kind', 'dtype', 'bytes', 'compacted_bytes', 'arrow_bytes'])\
+            .assign(table=table_name)
+
+    def __get_translated_dtypes__(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Get the dictionary dtypes of the translated columns of a table, which are updated by transform_dataframe.
+        """
+        if 'data_coding' not in self.dict.columns or 'pandas_dtype' not in self.dict.columns:
+            return {}
+        translated = self.dict.loc[self.dict['data_coding'].notnull() & self.dict.index.isin(df.columns), 'pandas_dtype']
+        return translated[~translated.index.duplicated()].to_dict()
+
+    def __update_dictionary__(self, pandas_dtypes: Dict[str, str]) -> None:
+        """
+        Update the dictionary dtypes of translated columns, for tables that were loaded from the cache.
+        """
+        if len(pandas_dtypes) == 0 or 'pandas_dtype' not in self.dict.columns:
+            return
+        with self.__dict_lock__:
+            for field, pandas_dtype in pandas_dtypes.items():
+                if field in self.dict.index:
+                    self.dict.loc[field, 'pandas_dtype'] = pandas_dtype
+
+    def __get_table_schema__(self, relative_location: str) -> Tuple[Union[List[str], None], List[str]]:
+        """
+        Get the columns and the index levels of a table from the parquet schema, without loading it.
+
+        Args:
+            relative_location (str): the location of the dataframe
+
+        Returns:
+            List[str]: the columns of the table (excluding its index), or None if the schema could not be read
+            List[str]: the index levels of the table
+        """
+        df_path = os.path.join(self.dataset_path, relative_location)
+        try:
+            schema = pq.read_schema(df_path)
+        except Exception:
+            return None, []
+        pandas_metadata = schema.pandas_metadata or {}
+        index_columns = [col for col in pandas_metadata.get('index_columns', []) if isinstance(col, str)]
+        return [col for col in schema.names if col not in index_columns], index_columns
+
+    def __load_one_dataframe__(self, relative_location: str, columns: List[str] = None,
+                               filters: List[tuple] = None) -> pd.DataFrame:
         """
         Load one dataframe.
 
         Args:
             relative_location (str): the location of the dataframe
+            columns (List[str], optional): the columns to load (in addition to the index). Defaults to None (all columns).
+            filters (List[tuple], optional): (field, op, value) filters on the rows, pushed down to the parquet scan,
+                which also skips row groups using their statistics. Defaults to None (all rows).
 
         Returns:
             pd.DataFrame: the loaded dataframe
         """
     
         df_path = os.path.join(self.dataset_path, relative_location)
+        read_parquet_kwargs = self.read_parquet_kwargs
+        if columns is not None:
+            read_columns = list(columns)
+            if self.valid_dates:
+                # timestamp columns are needed to filter rows exactly as when loading the full table
+                schema = pq.read_schema(df_path)
+                read_columns += [field.name for field in schema
+                                 if pa.types.is_timestamp(field.type) and field.name not in read_columns]
+            read_parquet_kwargs = dict(read_parquet_kwargs, columns=read_columns)
+        if filters:
+            read_parquet_kwargs = dict(read_parquet_kwargs, filters=list(filters))
+        if self.dtype_backend is not None:
+            read_parquet_kwargs = dict(read_parquet_kwargs, dtype_backend=self.dtype_backend)
         
         try:
-            data =  pd.read_parquet(df_path, **self.read_parquet_kwargs)
+            data =  pd.read_parquet(df_path, **read_parquet_kwargs)
         except Exception as err:
             if self.errors == 'raise':
                 warnings.warn(f'Error loading {df_path}:\n{err}')
@@ -756,9 +2761,14 @@ class PhenoLoader:
             if self.errors == 'warn':
                 warnings.warn(f'Error loading {df_path}:\n{err}')
             return None
+        if self.dtype_backend is not None:
+            data.index = self.__get_numpy_index__(data.index)
         
-        data = transform_dataframe(data, transform_from='coding', transform_to=self.preferred_language, 
-                                   dict_df=self.dict, mapping_df=self.data_codings)
+        # transform_dataframe updates the dictionary, so tables loaded concurrently are translated one at a time
+        with self.__dict_lock__:
+            data = transform_dataframe(data, transform_from='coding', transform_to=self.preferred_language, 
+                                       dict_df=self.dict, mapping_df=self.coding_mapping,
+                                       dtype_backend=self.dtype_backend)
             
         # set the order of columns according to the dictionary
         dict_columns = self.dict.index.intersection(data.columns)
@@ -770,12 +2780,17 @@ class PhenoLoader:
         if self.unique_index:
             data = data.loc[~data.index.duplicated()]
         if self.valid_dates:
-            data = data.loc[data.select_dtypes(include=['datetime64[ns]']).notnull().any(axis=1)]
+            date_columns = data.select_dtypes(include=['datetime64[ns]']).columns.tolist() + \
+                [col for col, dtype in data.dtypes.items() if isinstance(dtype, pd.ArrowDtype) and
+                 pa.types.is_timestamp(dtype.pyarrow_dtype) and dtype.pyarrow_dtype.tz is None]
+            data = data.loc[data[date_columns].notnull().any(axis=1)]
         if self.valid_stage:
             data = data.loc[data.index.get_level_values('research_stage').notnull()]
         after = len(data)
         if before > after:
             print(f'Filtered {before - after} rows')
+        if columns is not None:
+            data = data[[col for col in data.columns if col in columns]]
 
         return data
 
@@ -783,19 +2798,18 @@ class PhenoLoader:
         """
         Load dataset dictionary.
         """
-        self.dict = pd.read_csv(self.__get_dictionary_file_path__(self.dataset))\
+        self.dict = metadata_registry.read_csv(self.__get_dictionary_file_path__(self.dataset))\
             .dropna(subset='tabular_field_name')\
             .set_index('tabular_field_name')
 
-        if 'bulk_dictionary' not in self.dict.columns or len(self.dict.dropna(subset='bulk_dictionary')['bulk_dictionary']) == 0:
-            return
-
-        # bulk dictionaries
-        bulk_dicts = self.dataset_path + '/metadata/' + \
-            self.dict.dropna(subset='bulk_dictionary')['bulk_dictionary'] + '_bulk_dictionary.csv'
-        self.dict = pd.concat([self.dict] +
-            [pd.read_csv(bd).set_index('tabular_field_name').assign(parent_dataframe=tfn)
-             for tfn, bd in bulk_dicts.items()], axis=0)
+        if 'bulk_dictionary' in self.dict.columns and len(self.dict.dropna(subset='bulk_dictionary')['bulk_dictionary']) > 0:
+            # bulk dictionaries
+            bulk_dicts = self.dataset_path + '/metadata/' + \
+                self.dict.dropna(subset='bulk_dictionary')['bulk_dictionary'] + '_bulk_dictionary.csv'
+            self.dict = pd.concat([self.dict] +
+                [metadata_registry.read_csv(bd).set_index('tabular_field_name').assign(parent_dataframe=tfn)
+                 for tfn, bd in bulk_dicts.items()], axis=0)
+        self.field_index = FieldSearchIndex(self.dict)
 
     def __get_file_path__(self, dataset: str, extension: str) -> str:
         """
@@ -908,32 +2922,51 @@ class PhenoLoader:
         
         return new_data
 
-    def __slice_bulk_partition__(self, field_name: str, paths: pd.Series) -> pd.Series:
+    def __slice_bulk_partition__(self, field_name: Union[str, List[str]], paths: pd.Series) -> pd.Series:
         """
         Slice the bulk partition based on the field name.
 
         Args:
-            field_name (str): The name of the field.
+            field_name (str or List): The name of the field(s). Paths are sliced only for a single field,
+                and otherwise hold the partitions of all fields.
             paths (pd.Series): The paths to be sliced.
 
         Returns:
             pd.Series: The sliced paths.
         """
-        if 'field_type' not in self.dict:
+        if not isinstance(field_name, str):
+            if len(field_name) != 1:
+                return paths
+            field_name = field_name[0]
+        partition = self.__get_bulk_partition__(field_name)
+        if partition is None:
             return paths
 
+        # the given paths are not modified, since they may share memory with the paths of the samples
+        paths = paths.where(paths.str[-1] == '/', paths + '/')
+        return paths + partition + '=' + field_name + '/'
+
+    def __get_bulk_partition__(self, field_name: str) -> Union[None, str]:
+        """
+        Get the hive partition key that slices the bulk data of a field.
+
+        Args:
+            field_name (str): The name of the field.
+
+        Returns:
+            str: The partition key, or None if the bulk data is not partitioned.
+        """
+        if 'field_type' not in self.dict:
+            return None
+
         partition = self.dict.loc[field_name, 'field_type']
         if isinstance(partition, pd.Series):
             partition = partition.iloc[0]
         if type(partition) is not str:
-            return paths
+            return None
         if 'partition' not in partition:
-            return paths
-        partition = partition.split(':')[1].strip()
-
-        paths[paths.str[-1] != '/'] += '/'
-        paths += partition + '=' + field_name + '/'
-        return paths
+            return None
+        return partition.split(':')[1].strip()
 
     def __slice_bulk_data__(self, field_name: str) -> dict:
         """
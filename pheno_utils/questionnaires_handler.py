@@ -2,11 +2,13 @@
 
 # %% auto 0
 __all__ = ['valid_codings', 'convert_to_string', 'normalize_answers', 'flatten_series', 'check_invalid_values', 'replace_values',
-           'transform_answers', 'convert_codings_to_int', 'transform_dataframe']
+           'transform_answers', 'convert_codings_to_int', 'convert_from_arrow', 'convert_to_arrow',
+           'transform_dataframe']
 
 # %% ../nbs/13_questionnaire_handler.ipynb 3
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import warnings
 
 # %% ../nbs/13_questionnaire_handler.ipynb 4
@@ -197,12 +199,47 @@ def convert_codings_to_int(df: pd.Series, dict_df: pd.DataFrame) -> pd.Series:
         dict_df.loc[tabular_field_name, 'pandas_dtype'] = 'Int16'
         return df.astype('Int16', errors='ignore')
 
+def convert_from_arrow(series: pd.Series) -> pd.Series:
+    """
+    Convert an Arrow-backed series to the NumPy-backed dtypes that are used when reading parquet files by default
+    (e.g., lists become arrays), so that its answers can be translated.
+
+    Args:
+        series (pd.Series): The series.
+
+    Returns:
+        pd.Series: The converted series, or the same series if it is not Arrow-backed.
+    """
+    if not isinstance(series.dtype, pd.ArrowDtype):
+        return series
+    return pd.Series(pa.array(series.array).to_pandas().values, index=series.index, name=series.name)
+
+def convert_to_arrow(series: pd.Series) -> pd.Series:
+    """
+    Convert a translated series back to an Arrow-backed dtype. Categorical answers are kept as they are,
+    since they are already dictionary-encoded, and lists of answers become Arrow lists.
+
+    Args:
+        series (pd.Series): The series.
+
+    Returns:
+        pd.Series: The converted series.
+    """
+    if series.dtype != object:
+        return series
+    try:
+        array = pa.array(series.to_numpy(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return series
+    return pd.Series(pd.arrays.ArrowExtensionArray(array), index=series.index, name=series.name)
+
 def transform_dataframe(
     df: pd.DataFrame,
     transform_from: str,
     transform_to: str,
     dict_df: pd.DataFrame,
     mapping_df: pd.DataFrame,
+    dtype_backend: str = None,
 ) -> pd.DataFrame:
     if 'data_coding' not in dict_df.columns:
         warnings.warn("data_coding column not found in dictionary, skipping transformation")
@@ -228,6 +265,8 @@ def transform_dataframe(
         if pd.isna(data_coding):
             continue
 
+        # Arrow-backed columns are translated with NumPy-backed dtypes
+        transformed_df[column] = convert_from_arrow(transformed_df[column])
         if transform_from != transform_to:
             transformed_df[column] = transform_answers(
                     column,
@@ -244,4 +283,7 @@ def transform_dataframe(
                 dict_df=dict_df
             )
 
+        if dtype_backend == 'pyarrow':
+            transformed_df[column] = convert_to_arrow(transformed_df[column])
+
     return transformed_df